@@ -119,11 +119,10 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
-# Initialize webhook handler
-webhook_handler = WebhookHandler()
-
-# Create database tables
-create_tables()
+# Webhook handler, created with the database tables in startup_event. Spawned
+# pool workers re-import this module when it is run as a script, so nothing
+# with side effects runs at import time
+webhook_handler: Optional[WebhookHandler] = None
 
 # Environment variables
 GITHUB_CLIENT_ID = os.getenv("GITHUB_CLIENT_ID")
@@ -137,9 +136,18 @@ active_sessions = {}  # session_id -> user_id
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application"""
+    global webhook_handler
     print("BugSniper Pro starting up...")
+    
+    # Create database tables
+    create_tables()
+    # Initialize webhook handler
+    webhook_handler = WebhookHandler()
+    
     print(f"GitHub Client ID: {GITHUB_CLIENT_ID}")
     print(f"Webhook Secret: {'Set' if os.getenv('GITHUB_WEBHOOK_SECRET') else 'Not set'}")
+    # One pipeline (and its Gemini model and clients) shared by every webhook and approval
+    app.state.pipeline = AnalysisPipeline()
 
 # Health check endpoint
 @app.get("/")
@@ -324,6 +332,7 @@ async def add_repository_to_monitoring(
                 # Reactivate existing repository
                 existing_repo.is_active = True
                 db.commit()
+                webhook_handler.invalidate_monitored_repositories()
                 return {"message": "Repository monitoring reactivated", "repository_id": existing_repo.id}
         
         # Check repository permissions and get info from GitHub
@@ -365,6 +374,7 @@ async def add_repository_to_monitoring(
         db.add(repository)
         db.commit()
         db.refresh(repository)
+        webhook_handler.invalidate_monitored_repositories()
         
         webhook_message = "Repository added to monitoring with webhook"
         if webhook_result.get("id") == "existing":
@@ -423,6 +433,7 @@ async def start_monitoring(repo_id: int, db: Session = Depends(get_db)):
         repository.webhook_url = webhook_url
         repository.webhook_secret = webhook_secret
         db.commit()
+        webhook_handler.invalidate_monitored_repositories()
         
         return {"message": "Monitoring started", "webhook_id": webhook_result["id"]}
     else:
@@ -556,9 +567,9 @@ async def get_job(job_id: str, db: Session = Depends(get_db)):
     )
 
 @app.post("/api/jobs/{job_id}/approve")
-async def approve_job(job_id: str, db: Session = Depends(get_db)):
+async def approve_job(job_id: str, request: Request, db: Session = Depends(get_db)):
     """Approve job and create pull request"""
-    pipeline = AnalysisPipeline()
+    pipeline = request.app.state.pipeline
     result = await pipeline.approve_and_create_pr(job_id, db)
     
     if result["success"]:
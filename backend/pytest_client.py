@@ -3,27 +3,952 @@ import subprocess
 import json
 import tempfile
 import ast
+import atexit
+import copy
+import functools
+import hashlib
+import importlib.util
+import multiprocessing
 import re
-from typing import Dict, Any, List, Optional
+import shutil
+import signal
+import sys
+from typing import Callable, Dict, Any, Iterator, List, Optional, Set, Tuple
 import asyncio
-from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 import time
 
+try:
+    import re2 as _re
+except ImportError:
+    _re = re
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Files larger than this (usually generated code) are skipped by the analyzers
+MAX_ANALYZE_BYTES = 1 << 20
+
+# Upper bound on concurrent file reads when warming the source cache
+_PREFETCH_CONCURRENCY = 32
+
+# Upper bound on the diagnostic messages kept from static analysis
+MAX_STATIC_DIAGNOSTICS = 200
+
+# Directories that never hold analyzable source
+_IGNORE_DIRS = frozenset({
+    '.git', '__pycache__', '.venv', 'venv', 'node_modules',
+    '.tox', 'dist', 'build', '.pytest_cache', '.mypy_cache', 'site-packages'
+})
+
+# Every needle that can trigger one of the checks in _analyze_content_patterns,
+# searched for directly so the scan never has to match whole lines. The
+# pattern is plain regular (no backreferences) so re2 can run it as a DFA;
+# the multiline flag is inline because re2's compile() takes no re flags.
+_CONTENT_NEEDLE_RE = _re.compile(
+    rb'/tmp/|/var/|\bprint[^\S\n]+[^(\n]|(?m:^)[^\S\n]*global |open\('
+)
+_PY2_PRINT_RE = _re.compile(rb'\bprint\s+[^(]')
+
+# Substrings the mock checks in files that do not parse, found in one pass.
+# No needle can overlap another, so findall sees every one that occurs.
+_MOCK_FALLBACK_RE = _re.compile(rb'print[( ]|except:|eval\(|exec\(')
+
+# Counts in pytest's "collected N items" line and its final summary line
+# ("1 failed, 2 passed, 1 error in 0.5s"), plus the short summary entries
+# ("FAILED tests/test_x.py::TestX::test_y - AssertionError") printed by -rfE
+_COLLECTED_RE = re.compile(r'collected\s+(\d+)\s+item', re.IGNORECASE)
+_FINAL_LINE_RE = re.compile(r' in \d+(?:\.\d+)?s\b')
+_OUTCOME_RE = re.compile(r'(\d+) (passed|failed|error)')
+_SHORT_SUMMARY_RE = re.compile(r'(FAILED|ERROR) (\S+)')
+
+# Patterns used by PytestClient._clean_test_diagnostic. Test ids are usually
+# relative to the repository ("tests/test_x.py::..."), so no leading directory
+# is required before "tests/"
+_TEST_RESULT_RE = re.compile(r'(?:^|/)(tests/[^/]+\.py)::([^:]+)::([^:]+)\s+(FAILED|ERROR|PASSED)')
+_TEST_ID_RE = re.compile(r'tests/([^/]+\.py)::([^:]+)::([^:]+)')
+_TEMP_PATH_RES = (
+    (re.compile(r'/var/folders/[^/]+/'), ''),
+    (re.compile(r'/tmp/[^/]+/'), ''),
+    (re.compile(r'/.*?/tests/'), 'tests/'),
+    (re.compile(r'\.\.+'), '..'),
+    (re.compile(r'//+'), '/'),
+)
+
+# Short UI messages for failures in the generated test files: the file category
+# found in the test path maps to a default message and per-method overrides
+_TEST_CATEGORY_MESSAGES = {
+    "test_basic_functionality": ("Basic functionality issues", {
+        "test_python_files_exist": "No Python files found",
+        "test_no_syntax_errors": "Syntax errors detected",
+        "test_imports_work": "Import errors",
+    }),
+    "test_code_quality": ("Code quality issues", {
+        "test_no_bare_except": "Bare except clauses",
+        "test_no_eval_usage": "eval() usage (security risk)",
+    }),
+    "test_security": ("Security issues", {
+        "test_no_hardcoded_secrets": "Hardcoded secrets",
+        "test_no_sql_injection_patterns": "SQL injection risk",
+    }),
+    "test_performance": ("Performance issues", {
+        "test_no_infinite_loops": "Infinite loops",
+        "test_file_sizes_reasonable": "Files too large",
+    }),
+    "test_documentation": ("Documentation issues", {
+        "test_functions_have_docstrings": "Missing docstrings",
+        "test_classes_have_docstrings": "Missing class docs",
+    }),
+    "test_error_handling": ("Error handling issues", {
+        "test_files_have_error_handling": "Poor error handling",
+        "test_no_global_variables": "Too many globals",
+    }),
+    "test_imports": ("Import issues", {
+        "test_imports_are_valid": "Invalid imports",
+        "test_no_circular_imports": "Circular imports",
+    }),
+    "test_data_structures": ("Data structure issues", {
+        "test_no_mutable_default_arguments": "Mutable defaults",
+    }),
+    "test_configuration": ("Configuration issues", {}),
+    "test_integration": ("Integration issues", {
+        "test_main_modules_can_be_imported": "Module import issues",
+        "test_no_obvious_errors": "Runtime errors",
+    }),
+}
+_TEST_CATEGORY_RE = re.compile('|'.join(_TEST_CATEGORY_MESSAGES))
+
+# Failure categories for PytestClient._create_test_summary, tried in order:
+# each alternative looks ahead through the whole message, so the first
+# category whose keyword appears anywhere wins, as with an if/elif chain
+_SUMMARY_CATEGORIES = {
+    "security": "Security Issues",
+    "quality": "Code Quality",
+    "docs": "Documentation",
+    "errors": "Error Handling",
+    "performance": "Performance",
+}
+_SUMMARY_CATEGORY_RE = re.compile(
+    r'(?=.*(?:security|eval|secret))(?P<security>)'
+    r'|(?=.*(?:code_quality|bare except))(?P<quality>)'
+    r'|(?=.*(?:documentation|docstring))(?P<docs>)'
+    r'|(?=.*(?:error_handling|global))(?P<errors>)'
+    r'|(?=.*(?:performance|infinite))(?P<performance>)',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Message formats for the diagnostics collected by _mock_test_results
+_MOCK_DIAG_FMT = {
+    "skipped_large": "Skipped large file {0}: {1} bytes",
+    "unused_import": "Unused import '{0}' in {1}",
+    "mixed_print": "Mixed print syntax in {0}",
+    "bare_except": "Bare except clause in {0}",
+    "eval": "Use of eval() in {0}",
+    "exec": "Use of exec() in {0}",
+    "missing_docstring": "Function '{0}' in {1} missing docstring",
+    "error": "Error analyzing {0}: {1}",
+}
+
+# Parsed sources keyed by path, reset at the start of every run_tests call
+_SOURCE_CACHE: Dict[str, Tuple[Tuple[int, int], Tuple[bytes, Optional[ast.AST], Optional[SyntaxError]]]] = {}
+
+# Below this many files the process pool start-up costs more than it saves
+_PARALLEL_MIN_FILES = 32
+
+# Recent run_tests results keyed by repository content, most recent last
+_RESULT_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_RESULT_CACHE_SIZE = 64
+
+# Content digests keyed by path, trusted while the file's (mtime_ns, size) is
+# unchanged, so cache keys only re-read files that were touched; oldest first
+_DIGEST_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], bytes]]" = OrderedDict()
+_DIGEST_CACHE_SIZE = 50000
+
+# Per-file analysis results, keyed by (analyzer, path relative to the repository,
+# content digest) since workspaces and patched copies put the same sources
+# under fresh roots
+_ANALYSIS_CACHE: "OrderedDict[Tuple[str, str, bytes], Tuple[List[Any], int]]" = OrderedDict()
+_ANALYSIS_CACHE_SIZE = 20000
+
+
+class _IssueVisitor(ast.NodeVisitor):
+    """Single-pass AST visitor recording the facts both analyzers need for one file"""
+    
+    _TRACKED_CALLS = frozenset({'eval', 'exec'})
+    
+    def __init__(self):
+        self.names_used = set()
+        # ("import", name as written, name bound), ("except", lineno),
+        # ("call", name, lineno) and ("function", node), in source order
+        self.events = []
+    
+    def visit_Name(self, node):
+        self.names_used.add(node.id)
+    
+    def visit_Import(self, node):
+        for alias in node.names:
+            written = alias.asname or alias.name
+            self.events.append(("import", written, alias.asname or alias.name.split('.')[0]))
+    
+    def visit_ImportFrom(self, node):
+        if node.module != '__future__':
+            for alias in node.names:
+                if alias.name != '*':
+                    written = alias.asname or alias.name
+                    self.events.append(("import", written, written))
+    
+    def visit_ExceptHandler(self, node):
+        if node.type is None:
+            self.events.append(("except", node.lineno))
+        self.generic_visit(node)
+    
+    def visit_Call(self, node):
+        name = getattr(node.func, 'id', None)
+        if name in self._TRACKED_CALLS:
+            self.events.append(("call", name, node.lineno))
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node):
+        self.events.append(("function", node))
+        self.generic_visit(node)
+
+
+_CALL_MSGS = {
+    'eval': "Use of eval() detected in {filename} (line {lineno}) - security risk",
+    'exec': "Use of exec() detected in {filename} (line {lineno}) - security risk",
+}
+
+
+def _visit_tree(tree: ast.AST) -> _IssueVisitor:
+    """Run the fused visitor over a parsed module"""
+    visitor = _IssueVisitor()
+    visitor.visit(tree)
+    return visitor
+
+
+def _analyze_ast_for_issues(tree: ast.AST, filename: str) -> List[str]:
+    """Analyze AST for common issues"""
+    visitor = _visit_tree(tree)
+    issues = []
+    for event in visitor.events:
+        kind = event[0]
+        if kind == "import":
+            # Unused imports are checked against every name referenced in the module
+            if event[2] not in visitor.names_used:
+                issues.append(f"Unused import '{event[2]}' in {filename}")
+        elif kind == "except":
+            issues.append(f"Bare except clause in {filename} (line {event[1]})")
+        elif kind == "call":
+            issues.append(_CALL_MSGS[event[1]].format(filename=filename, lineno=event[2]))
+        else:
+            node = event[1]
+            if not node.name.startswith('_'):
+                # Check for missing docstrings and return type hints
+                if not ast.get_docstring(node):
+                    issues.append(f"Function '{node.name}' in {filename} missing docstring")
+                if node.returns is None:
+                    issues.append(f"Function '{node.name}' in {filename} missing return type hint")
+    return issues
+
+
+def _analyze_content_patterns(content: bytes, filename: str) -> List[str]:
+    """Analyze content for patterns that indicate issues"""
+    issues = []
+    has_close = b'close()' in content
+    lineno = 1
+    last_pos = 0
+    
+    # Only lines holding a needle can produce an issue, so the per-line
+    # checks run on those lines alone; each line is visited at most once
+    match = _CONTENT_NEEDLE_RE.search(content)
+    while match:
+        start = content.rfind(b'\n', 0, match.start()) + 1
+        end = content.find(b'\n', match.end())
+        if end == -1:
+            end = len(content)
+        lineno += content.count(b'\n', last_pos, start)
+        last_pos = start
+        line = content[start:end]
+        match = _CONTENT_NEEDLE_RE.search(content, end)
+        text = None
+        
+        # Check for hardcoded paths
+        if b'/tmp/' in line or b'/var/' in line:
+            text = line.strip().decode('utf-8', 'replace')
+            issues.append(f"Hardcoded path detected in {filename} (line {lineno}): {text}")
+        
+        # Check for Python 2 style print statements; lines that matched another
+        # needle usually lack "print", and the substring test is far cheaper
+        if b'print' in line and _PY2_PRINT_RE.search(line):
+            text = text or line.strip().decode('utf-8', 'replace')
+            issues.append(f"Python 2 style print statement in {filename} (line {lineno}): {text}")
+        
+        # Check for global variables
+        if line.strip().startswith(b'global '):
+            text = text or line.strip().decode('utf-8', 'replace')
+            issues.append(f"Global variable usage in {filename} (line {lineno}): {text}")
+        
+        # Check for resource leaks (open without close)
+        if b'open(' in line and b'with ' not in line and not has_close:
+            issues.append(f"Potential resource leak in {filename} (line {lineno}): file opened without proper cleanup")
+    
+    return issues
+
+
+async def _run_subprocess(cmd: List[str], cwd: Optional[str] = None, timeout: Optional[float] = None,
+                          input: Optional[bytes] = None, check: bool = False) -> subprocess.CompletedProcess:
+    """Run a command without blocking the event loop, mirroring subprocess.run"""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(input), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    
+    result = subprocess.CompletedProcess(
+        cmd, proc.returncode,
+        stdout.decode('utf-8', 'replace'), stderr.decode('utf-8', 'replace')
+    )
+    if check:
+        result.check_returncode()
+    return result
+
+
+async def _run_subprocess_streaming(cmd: List[str], on_line: Callable[[str], None],
+                                    cwd: Optional[str] = None,
+                                    timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+    """Like _run_subprocess, but hand each stdout line to on_line while the process still runs"""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=1 << 20
+    )
+    # Reader and parser are decoupled by a bounded queue, so parsing overlaps the
+    # process's own output instead of waiting for it to exit
+    queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=64)
+    chunks: List[str] = []
+    
+    async def feed() -> None:
+        async for raw in proc.stdout:
+            await queue.put(raw)
+        await queue.put(None)
+    
+    async def parse() -> None:
+        while (raw := await queue.get()) is not None:
+            text = raw.decode('utf-8', 'replace')
+            chunks.append(text)
+            on_line(text[:-1] if text.endswith('\n') else text)
+    
+    gathered = asyncio.gather(feed(), parse(), proc.stderr.read(), proc.wait())
+    try:
+        _, _, stderr, _ = await asyncio.wait_for(gathered, timeout)
+    except BaseException as e:
+        # A timeout, an over-long line (ValueError from the stream reader) or
+        # cancellation: stop the reader tasks and the process, never leave it
+        # running against a pipe nobody reads
+        gathered.cancel()
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        await proc.wait()
+        if isinstance(e, asyncio.TimeoutError):
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        raise
+    
+    return subprocess.CompletedProcess(
+        cmd, proc.returncode, ''.join(chunks), stderr.decode('utf-8', 'replace')
+    )
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of text without building the full split('\\n') list"""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _iter_py(root: str) -> Iterator[str]:
+    """Yield paths of regular .py files under root, pruning directories in _IGNORE_DIRS"""
+    return (path for path in _iter_files(root) if path.endswith('.py'))
+
+
+def _iter_files(root: str) -> Iterator[str]:
+    """Yield paths of all regular files under root, pruning directories in _IGNORE_DIRS"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _IGNORE_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path
+
+
+def _load_source(file_path: str) -> Tuple[bytes, Optional[ast.AST], Optional[SyntaxError]]:
+    """Read and parse a file, reusing the cached result while its mtime and size are unchanged"""
+    st = os.stat(file_path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _SOURCE_CACHE.get(file_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    
+    # Parse the AST (ast.parse decodes the bytes itself)
+    try:
+        entry = (content, ast.parse(content), None)
+    except SyntaxError as e:
+        entry = (content, None, e)
+    
+    _SOURCE_CACHE[file_path] = (key, entry)
+    return entry
+
+
+def _prefetch_one(file_path: str) -> None:
+    """Warm the source cache for one file, leaving oversized files unread"""
+    if os.path.getsize(file_path) <= MAX_ANALYZE_BYTES:
+        _load_source(file_path)
+
+
+async def _prefetch_sources(python_files: List[str]) -> None:
+    """Read and parse files concurrently so their disk latency overlaps"""
+    sem = asyncio.Semaphore(_PREFETCH_CONCURRENCY)
+    
+    async def _read(file_path: str) -> None:
+        async with sem:
+            await asyncio.to_thread(_prefetch_one, file_path)
+    
+    # Failures are left for the analysis loop to hit and report per file
+    await asyncio.gather(*(_read(f) for f in python_files), return_exceptions=True)
+
+
+_ANALYSIS_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _get_analysis_pool() -> ProcessPoolExecutor:
+    """Return the shared worker pool for per-file analysis, creating it on first use"""
+    global _ANALYSIS_POOL
+    if _ANALYSIS_POOL is None:
+        # Leave one core free for the event loop serving other requests; spawned
+        # workers start clean instead of forking a process that runs threads
+        _ANALYSIS_POOL = ProcessPoolExecutor(
+            max_workers=max(1, (os.cpu_count() or 1) - 1),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _ANALYSIS_POOL
+
+
+def _analyze_uncached(worker: Callable[[str], Tuple[List[Any], int]], file_path: str) -> Tuple[List[Any], int]:
+    """Pool entry point: run an analyzer without keeping the parsed file in the long-lived worker"""
+    try:
+        return worker(file_path)
+    finally:
+        _SOURCE_CACHE.pop(file_path, None)
+
+
+async def _analyze_files(worker: Callable[[str], Tuple[List[Any], int]], repo_path: str,
+                         python_files: List[str]) -> List[Tuple[List[Any], int]]:
+    """Run a per-file analyzer over the files, reusing results for content seen before"""
+    keys = await asyncio.to_thread(lambda: [_analysis_key(repo_path, f) for f in python_files])
+    keys = [None if key is None else (worker.__name__,) + key for key in keys]
+    # Hits are copied out now: a concurrent run may evict them while this one
+    # awaits its misses
+    cached = {key: _ANALYSIS_CACHE[key] for key in keys if key is not None and key in _ANALYSIS_CACHE}
+    hits = [key in cached for key in keys]
+    misses = [f for f, hit in zip(python_files, hits) if not hit]
+    
+    # Analysis is CPU-bound, so large batches are spread across processes that
+    # read their own files; smaller ones load the sources concurrently and then
+    # only do CPU work in a thread against the warm cache
+    if len(misses) >= _PARALLEL_MIN_FILES:
+        pool = _get_analysis_pool()
+        task = functools.partial(_analyze_uncached, worker)
+        fresh = await asyncio.to_thread(lambda: list(pool.map(task, misses, chunksize=16)))
+    else:
+        await _prefetch_sources(misses)
+        fresh = await asyncio.to_thread(lambda: [worker(f) for f in misses])
+    
+    fresh_iter = iter(fresh)
+    results = []
+    for key, hit in zip(keys, hits):
+        if hit:
+            if key in _ANALYSIS_CACHE:
+                _ANALYSIS_CACHE.move_to_end(key)
+            results.append(cached[key])
+            continue
+        result = next(fresh_iter)
+        # Failures carry the workspace path and the exception text, which a
+        # later run under another root must not report, so they are not kept
+        if key is not None and not any(
+            isinstance(issue, tuple) and issue[0] == "error" for issue in result[0]
+        ):
+            _ANALYSIS_CACHE[key] = result
+            if len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_SIZE:
+                _ANALYSIS_CACHE.popitem(last=False)
+        results.append(result)
+    return results
+
+
+def _mock_analyze_file(py_file: str) -> Tuple[List[Tuple[Any, ...]], int]:
+    """Collect one file's mock diagnostics as (code, *args) tuples, plus its bug count"""
+    diagnostics = []
+    bugs = []
+    name = os.path.basename(py_file)
+    try:
+        size = os.path.getsize(py_file)
+        if size > MAX_ANALYZE_BYTES:
+            diagnostics.append(("skipped_large", name, size))
+            return diagnostics, 0
+        
+        content, tree, _ = _load_source(py_file)
+        
+        visitor = _visit_tree(tree) if tree is not None else None
+        
+        # Check for unused imports against the names referenced in the module
+        if visitor is not None:
+            for event in visitor.events:
+                if event[0] == "import" and event[2] not in visitor.names_used:
+                    diagnostics.append(("unused_import", event[1], name))
+        
+        # Check for syntax issues, then for potential bugs, from the AST when the
+        # file parses and from a single substring scan when it does not
+        if visitor is not None:
+            mixed_print = b"print(" in content and b"print " in content
+            kinds = {event[0] if event[0] != "call" else event[1] for event in visitor.events}
+            has_bare_except = "except" in kinds
+            has_eval = "eval" in kinds
+            has_exec = "exec" in kinds
+        else:
+            found = set(_MOCK_FALLBACK_RE.findall(content))
+            mixed_print = b"print(" in found and b"print " in found
+            has_bare_except = b"except:" in found
+            has_eval = b"eval(" in found
+            has_exec = b"exec(" in found
+        
+        if mixed_print:
+            diagnostics.append(("mixed_print", name))
+        
+        if has_bare_except:
+            diagnostics.append(("bare_except", name))
+            bugs.append("Bare except clause - should specify exception type")
+        
+        if has_eval:
+            diagnostics.append(("eval", name))
+            bugs.append("Use of eval() - security risk")
+        
+        if has_exec:
+            diagnostics.append(("exec", name))
+            bugs.append("Use of exec() - security risk")
+        
+        # Check for missing docstrings in functions
+        if visitor is not None:
+            for event in visitor.events:
+                if event[0] == "function" and not ast.get_docstring(event[1]):
+                    diagnostics.append(("missing_docstring", event[1].name, name))
+        
+    except Exception as e:
+        # The exception type and directory let the caller fold repeated failures
+        diagnostics.append(("error", name, str(e), type(e).__name__, os.path.dirname(py_file)))
+    
+    return diagnostics, len(bugs)
+
+
+def _analyze_file_worker(file_path: str) -> Tuple[List[str], int]:
+    """Analyze a single Python file, returning its diagnostics and failure count"""
+    file = os.path.basename(file_path)
+    try:
+        size = os.path.getsize(file_path)
+        if size > MAX_ANALYZE_BYTES:
+            return [f"Skipped large file {file}: {size} bytes"], 0
+        
+        content, tree, syntax_error = _load_source(file_path)
+        if syntax_error is not None:
+            return [f"Syntax error in {file}: {syntax_error}"], 1
+        
+        # Check for various issues, then for patterns in the raw content
+        issues = _analyze_ast_for_issues(tree, file)
+        issues.extend(_analyze_content_patterns(content, file))
+        # No single file can contribute more than the report keeps, so there is
+        # no point shipping the rest back from a pool worker
+        return issues[:MAX_STATIC_DIAGNOSTICS], len(issues)
+        
+    except Exception as e:
+        return [f"Error analyzing {file}: {e}"], 1
+
+
+# Long-lived interpreter with pytest already imported. Each request runs in a
+# forked child, so test modules never leak from one repository into the next.
+_PYTEST_HARNESS = r"""
+import json, os, sys
+import pytest
+
+sys.path[:] = [p for p in sys.path if p]
+
+for line in sys.stdin:
+    request = json.loads(line)
+    sys.stdout.flush()
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            os.setsid()
+            os.chdir(request["cwd"])
+            for fd, path in ((1, request["stdout"]), (2, request["stderr"])):
+                os.dup2(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC), fd)
+            code = int(pytest.main(request["args"]))
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+    sys.stdout.write(json.dumps({"pid": pid}) + "\n")
+    sys.stdout.flush()
+    _, status = os.waitpid(pid, 0)
+    sys.stdout.write(json.dumps({"returncode": os.waitstatus_to_exitcode(status)}) + "\n")
+    sys.stdout.flush()
+"""
+
+
+class _PytestDaemon:
+    """Warm pytest interpreter that runs one pytest invocation at a time"""
+    
+    def __init__(self):
+        self._proc = None
+        # The harness answers requests strictly in order, so every run in this
+        # process queues on one lock rather than forking in parallel; patched
+        # runs get their parallelism from the separate _PATCH_POOL workers
+        self._lock = asyncio.Lock()
+    
+    async def _ensure_started(self):
+        if self._proc is None or self._proc.returncode is not None:
+            self._proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-c", _PYTEST_HARNESS,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE
+            )
+    
+    async def _read_reply(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        line = await asyncio.wait_for(self._proc.stdout.readline(), timeout)
+        if not line:
+            # The harness died; the next run starts a fresh one
+            self._proc = None
+            raise RuntimeError("pytest daemon exited unexpectedly")
+        return json.loads(line)
+    
+    @staticmethod
+    def _kill_run(pid: int) -> None:
+        """Kill a forked pytest run and everything it started"""
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+    
+    def _discard(self) -> None:
+        """Kill the harness so the next run starts a fresh one"""
+        if self._proc is not None and self._proc.returncode is None:
+            self._proc.kill()
+        self._proc = None
+    
+    async def run(self, args: List[str], cwd: str, timeout: float) -> subprocess.CompletedProcess:
+        async with self._lock:
+            await self._ensure_started()
+            with tempfile.TemporaryDirectory(prefix="pytest_daemon_") as tmp:
+                request = {
+                    "args": args,
+                    "cwd": cwd,
+                    "stdout": os.path.join(tmp, "stdout"),
+                    "stderr": os.path.join(tmp, "stderr")
+                }
+                pid = None
+                finished = False
+                try:
+                    self._proc.stdin.write((json.dumps(request) + "\n").encode())
+                    await self._proc.stdin.drain()
+                    
+                    pid = (await self._read_reply())["pid"]
+                    try:
+                        reply = await self._read_reply(timeout)
+                    except asyncio.TimeoutError:
+                        self._kill_run(pid)
+                        await self._read_reply()
+                        finished = True
+                        raise subprocess.TimeoutExpired(["pytest", *args], timeout)
+                    finished = True
+                finally:
+                    if not finished:
+                        # Cancelled or failed mid-exchange: the harness may still owe
+                        # replies for this request, which the next run would read as
+                        # its own, so the run and the harness are both dropped
+                        if pid is not None:
+                            self._kill_run(pid)
+                        self._discard()
+                
+                with open(request["stdout"], encoding="utf-8", errors="replace") as f:
+                    stdout = f.read()
+                with open(request["stderr"], encoding="utf-8", errors="replace") as f:
+                    stderr = f.read()
+        
+        return subprocess.CompletedProcess(["pytest", *args], reply["returncode"], stdout, stderr)
+
+
+_PATCH_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _get_patch_pool() -> ProcessPoolExecutor:
+    """Return the shared worker pool for patched test runs, creating it on first use"""
+    global _PATCH_POOL
+    if _PATCH_POOL is None:
+        # Spawned workers start clean instead of inheriting this process's event loop
+        _PATCH_POOL = ProcessPoolExecutor(
+            max_workers=max(2, (os.cpu_count() or 1) // 2),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _PATCH_POOL
+
+
+def _file_digest(path: str) -> bytes:
+    """Digest of a file's bytes, read in fixed-size chunks so large files never sit in memory"""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, hashlib.blake2b).digest()
+
+
+def _stat_digest(path: str) -> bytes:
+    """_file_digest, reusing the last digest of path while its mtime and size are unchanged"""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _DIGEST_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    
+    digest = _file_digest(path)
+    # Evicted in insertion order; this runs in worker threads, where a
+    # move_to_end could race another thread's eviction
+    _DIGEST_CACHE[path] = (stamp, digest)
+    if len(_DIGEST_CACHE) > _DIGEST_CACHE_SIZE:
+        _DIGEST_CACHE.popitem(last=False)
+    return digest
+
+
+def _content_key(repo_path: str, generate_tests: bool) -> str:
+    """Hash every file pytest could read (sources, config, fixtures, data) by relative path and content"""
+    digest = hashlib.blake2b(b"gen" if generate_tests else b"nogen")
+    for path in sorted(_iter_files(repo_path)):
+        digest.update(os.path.relpath(path, repo_path).encode('utf-8', 'surrogateescape') + b"\0")
+        # Only files whose stat changed since they were last hashed are read
+        digest.update(_stat_digest(path))
+    return digest.hexdigest()
+
+
+def _analysis_key(repo_path: str, path: str) -> Optional[Tuple[str, bytes]]:
+    """Cache key for a file's static analysis, or None when it should not be cached"""
+    try:
+        # Oversized files are skipped by the worker without being read
+        if os.path.getsize(path) > MAX_ANALYZE_BYTES:
+            return None
+        return os.path.relpath(path, repo_path), _file_digest(path)
+    except OSError:
+        return None
+
+
+def _write_if_changed(path: str, content: str) -> bool:
+    """Write a file unless it already holds exactly this content"""
+    data = content.encode('utf-8')
+    try:
+        # A size mismatch settles it without reading the old file
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
+    
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+# Never needed by a patched test run: git metadata and bytecode/test caches
+_COPY_IGNORE = shutil.ignore_patterns('.git', '__pycache__', '*.pyc', '.pytest_cache')
+
+# Linux ioctl that makes a file share another's blocks (Btrfs, XFS, bcachefs)
+_FICLONE = 0x40049409 if fcntl is not None and sys.platform.startswith('linux') else None
+# Devices where FICLONE has already failed, so copies there go straight to shutil.copy
+_NO_REFLINK_DEVICES: Set[int] = set()
+
+
+def _clone_file(src: str, dst: str, device: int) -> None:
+    """Copy one file as a reflink sharing src's blocks, falling back to a byte copy"""
+    if device not in _NO_REFLINK_DEVICES:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copymode(src, dst)
+            return
+        except OSError:
+            _NO_REFLINK_DEVICES.add(device)
+    shutil.copy(src, dst)
+
+
+def _copy_tree(src: str, dst: str) -> None:
+    """Copy a directory tree, copying its files on a small thread pool"""
+    # Reflinks only work within one filesystem, and cost no data copy at all there
+    device = os.stat(src).st_dev
+    if _FICLONE is not None and device == os.stat(dst).st_dev and device not in _NO_REFLINK_DEVICES:
+        copy_file = functools.partial(_clone_file, device=device)
+    else:
+        # shutil.copy uses sendfile on Linux and skips copy2's metadata pass
+        copy_file = shutil.copy
+    
+    futures = []
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        # copytree creates the directories itself; file contents go to the pool
+        shutil.copytree(src, dst, dirs_exist_ok=True, ignore=_COPY_IGNORE,
+                        copy_function=lambda s, d: futures.append(pool.submit(copy_file, s, d)))
+    for future in futures:
+        future.result()
+
+
+def _patch_failure(e: subprocess.CalledProcessError) -> Dict[str, Any]:
+    """Result reported when git apply rejects a patch"""
+    return {
+        "passed": False,
+        "total_tests": 0,
+        "failed_tests": 1,
+        "diagnostics": [f"Failed to apply patch: {e.stderr}"],
+        "error_details": str(e),
+        "execution_time": 0.0
+    }
+
+
+_WORKER_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+# Detached worktrees kept warm between patched runs, keyed by the real path of
+# the checkout they belong to. Each patch worker process owns its own.
+_WARM_WORKTREES: Dict[str, str] = {}
+
+
+def _drop_worktree(repo_path: str, worktree: str) -> None:
+    """Unregister a warm worktree from its checkout (if still there) and delete it"""
+    if os.path.isdir(repo_path):
+        subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=repo_path,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
+    shutil.rmtree(worktree, ignore_errors=True)
+
+
+@atexit.register
+def _drop_warm_worktrees() -> None:
+    for repo_path, worktree in _WARM_WORKTREES.items():
+        try:
+            _drop_worktree(repo_path, worktree)
+        except (OSError, subprocess.SubprocessError):
+            pass
+    _WARM_WORKTREES.clear()
+
+
+def _patch_and_test(repo_path: str, patch_content: str) -> Dict[str, Any]:
+    """Worker entry point for run_tests_with_patch"""
+    global _WORKER_LOOP
+    # Keep one loop per worker: the pytest daemon's pipes and lock are bound
+    # to the loop that started it, so asyncio.run() per job would strand them
+    if _WORKER_LOOP is None:
+        _WORKER_LOOP = asyncio.new_event_loop()
+    return _WORKER_LOOP.run_until_complete(PytestClient()._run_tests_with_patch(repo_path, patch_content))
+
+
+# Read once per process; the pipeline and every patch job build their own client
+_MOCK_MODE = os.getenv("PYTEST_MOCK", "0") == "1"
+_XDIST_AVAILABLE = importlib.util.find_spec("xdist") is not None
+
+# Result of the "pytest --version" probe used when there is no daemon
+_PYTEST_ON_PATH: Optional[bool] = None
+
+# Shared across PytestClient instances so the interpreter stays warm between jobs
+_PYTEST_DAEMON = (
+    _PytestDaemon()
+    if hasattr(os, "fork") and importlib.util.find_spec("pytest") is not None
+    else None
+)
+
+
 class PytestClient:
     def __init__(self):
-        self.mock_mode = os.getenv("PYTEST_MOCK", "0") == "1"
+        self.mock_mode = _MOCK_MODE
+        self.xdist_available = _XDIST_AVAILABLE
     
     async def run_tests(self, repo_path: str, generate_tests_if_missing: bool = True) -> Dict[str, Any]:
         """
         Run pytest tests on the repository
         Returns test results with diagnostics
         """
-        if self.mock_mode:
-            return await self._mock_test_results(repo_path)
+        _SOURCE_CACHE.clear()
         
+        if self.mock_mode:
+            python_files, _ = self._enumerate(repo_path)
+            return await self._mock_test_results(repo_path, python_files)
+        
+        # Walk the repository once and share the file lists between the passes;
+        # the pytest probe is independent of the walk, so the two overlap
+        (python_files, test_files), pytest_ok = await asyncio.gather(
+            asyncio.to_thread(self._enumerate, repo_path),
+            self._probe_pytest()
+        )
+        
+        # Workspaces are fresh checkouts, so reruns of the same tree are
+        # recognised by content rather than by path. Every file counts, since
+        # pytest.ini, conftest data and fixtures change the outcome too
+        key = await asyncio.to_thread(_content_key, repo_path, generate_tests_if_missing)
+        cached = _RESULT_CACHE.get(key)
+        if cached is not None:
+            _RESULT_CACHE.move_to_end(key)
+            return copy.deepcopy(cached)
+        
+        result = await self._run_tests_uncached(
+            repo_path, python_files, test_files, pytest_ok, generate_tests_if_missing
+        )
+        
+        # A timeout says nothing about the code, so it is not remembered
+        if result.get("test_method") != "pytest_timeout":
+            _RESULT_CACHE[key] = copy.deepcopy(result)
+            if len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+                _RESULT_CACHE.popitem(last=False)
+        return result
+    
+    async def _run_tests_uncached(self, repo_path: str, python_files: List[str], test_files: List[str],
+                                  pytest_ok: bool, generate_tests_if_missing: bool) -> Dict[str, Any]:
+        """Run pytest, generated tests or static analysis, whichever applies first"""
         try:
             # Try to run pytest
-            pytest_result = await self._run_pytest(repo_path)
+            pytest_result = await self._run_pytest(repo_path, python_files, test_files, pytest_ok)
             
             # If no tests found and generation is enabled, try to generate tests
             if generate_tests_if_missing and pytest_result and pytest_result.get("total_tests", 0) == 0:
@@ -38,64 +963,153 @@ class PytestClient:
             
             # If pytest fails completely, fall back to static analysis
             print("Pytest failed, falling back to static analysis")
-            return await self._run_static_analysis(repo_path)
+            return await self._run_static_analysis(repo_path, python_files)
             
         except Exception as e:
             print(f"Pytest execution failed: {e}")
             return await self._run_static_analysis(repo_path)
     
+    def _enumerate(self, repo_path: str) -> Tuple[List[str], List[str]]:
+        """Return (all Python files, test files) from a single walk of the repository"""
+        python_files = []
+        test_files = []
+        for path in _iter_py(repo_path):
+            python_files.append(path)
+            name = os.path.basename(path)
+            if name.startswith('test_') or name.endswith('_test.py') or 'test' in name.lower():
+                test_files.append(path)
+        return python_files, test_files
+    
     async def run_tests_with_patch(self, repo_path: str, patch_content: str) -> Dict[str, Any]:
         """
         Apply patch and run tests
+        Runs in a separate worker process so the patched run can't leak state into this one
         """
-        # Create a temporary copy of the repo
-        temp_repo = tempfile.mkdtemp(prefix="pytest_patch_")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_patch_pool(), _patch_and_test, repo_path, patch_content)
+    
+    async def _run_tests_with_patch(self, repo_path: str, patch_content: str) -> Dict[str, Any]:
+        """Copy the repo, apply the patch and run the tests in the current process"""
+        patch_bytes = patch_content.encode()
         
+        # Dry-run the patch against the original tree so one that cannot apply
+        # is rejected before a worktree or copy is prepared for it
         try:
-            # Copy repo to temp location
-            import shutil
-            shutil.copytree(repo_path, temp_repo, dirs_exist_ok=True)
-            
-            # Apply patch
-            patch_file = os.path.join(temp_repo, "patch.diff")
-            with open(patch_file, "w") as f:
-                f.write(patch_content)
+            await _run_subprocess(["git", "apply", "--check", "--whitespace=nowarn", "-"],
+                                  cwd=repo_path, input=patch_bytes, check=True)
+        except subprocess.CalledProcessError as e:
+            return _patch_failure(e)
+        
+        # Reuse a warm worktree for clean git checkouts, copy the repo otherwise
+        temp_repo = await self._checkout_worktree(repo_path)
+        is_worktree = temp_repo is not None
+        
+        try:
+            if not is_worktree:
+                temp_repo = tempfile.mkdtemp(prefix="pytest_patch_")
+                await asyncio.to_thread(_copy_tree, repo_path, temp_repo)
             
-            # Apply patch using git
+            # Apply patch using git, streaming the diff through stdin
             try:
-                subprocess.run(["git", "apply", patch_file], 
-                             cwd=temp_repo, check=True, capture_output=True)
+                await _run_subprocess(["git", "apply", "--whitespace=nowarn", "-"], cwd=temp_repo,
+                                      input=patch_bytes, check=True)
             except subprocess.CalledProcessError as e:
-                return {
-                    "passed": False,
-                    "total_tests": 0,
-                    "failed_tests": 1,
-                    "diagnostics": [f"Failed to apply patch: {e.stderr.decode()}"],
-                    "error_details": str(e),
-                    "execution_time": 0.0
-                }
+                return _patch_failure(e)
             
             # Run tests on patched code
             return await self.run_tests(temp_repo)
             
         finally:
-            # Cleanup
-            import shutil
-            shutil.rmtree(temp_repo, ignore_errors=True)
+            # Warm worktrees are reset by the next checkout instead of deleted
+            if not is_worktree:
+                # Cleanup in the default executor so the caller isn't blocked on the delete
+                asyncio.get_running_loop().run_in_executor(None, shutil.rmtree, temp_repo, True)
+    
+    async def _checkout_worktree(self, repo_path: str) -> Optional[str]:
+        """
+        Return a detached worktree at repo_path's HEAD if repo_path is a checkout root without tracked changes
+        The worktree from the previous run is reset in place rather than recreated
+        """
+        # Forget worktrees whose checkout has since been deleted
+        for stale in [path for path in _WARM_WORKTREES if not os.path.isdir(path)]:
+            await asyncio.to_thread(_drop_worktree, stale, _WARM_WORKTREES.pop(stale))
+        
+        try:
+            key = os.path.realpath(repo_path)
+            toplevel = await _run_subprocess(["git", "rev-parse", "--show-toplevel"],
+                                             cwd=repo_path, timeout=30, check=True)
+            if os.path.realpath(toplevel.stdout.strip()) != key:
+                return None
+            
+            # A worktree only holds committed content, so changes to tracked files
+            # need a real copy. Untracked files (such as the tests/ run_tests
+            # generates) are carried over by _copy_untracked instead
+            status = await _run_subprocess(["git", "status", "--porcelain", "--untracked-files=no"],
+                                           cwd=repo_path, timeout=30, check=True)
+            if status.stdout.strip():
+                return None
+            
+            head = await _run_subprocess(["git", "rev-parse", "HEAD"], cwd=repo_path, timeout=30, check=True)
+            head = head.stdout.strip()
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+            return None
+        
+        worktree = _WARM_WORKTREES.get(key)
+        if worktree is not None:
+            # Only the files the last patch and test run touched get rewritten
+            try:
+                await _run_subprocess(["git", "reset", "--hard", "-q", head], cwd=worktree, timeout=60, check=True)
+                await _run_subprocess(["git", "clean", "-fdxq"], cwd=worktree, timeout=60, check=True)
+                await self._copy_untracked(repo_path, worktree)
+                return worktree
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+                del _WARM_WORKTREES[key]
+                await asyncio.to_thread(_drop_worktree, key, worktree)
+        
+        worktree = tempfile.mkdtemp(prefix="pytest_patch_")
+        try:
+            await _run_subprocess(["git", "worktree", "add", "--detach", worktree, head],
+                                  cwd=repo_path, timeout=30, check=True)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            shutil.rmtree(worktree, ignore_errors=True)
+            return None
+        _WARM_WORKTREES[key] = worktree
+        
+        try:
+            await self._copy_untracked(repo_path, worktree)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+            del _WARM_WORKTREES[key]
+            await asyncio.to_thread(_drop_worktree, key, worktree)
+            return None
+        return worktree
+    
+    async def _copy_untracked(self, repo_path: str, worktree: str) -> None:
+        """Copy repo_path's untracked, non-ignored files into the worktree"""
+        listing = await _run_subprocess(["git", "ls-files", "--others", "--exclude-standard", "-z"],
+                                        cwd=repo_path, timeout=30, check=True)
+        
+        def copy_all() -> None:
+            for rel_path in filter(None, listing.stdout.split('\0')):
+                target = os.path.join(worktree, rel_path)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy(os.path.join(repo_path, rel_path), target)
+        
+        await asyncio.to_thread(copy_all)
     
-    async def _mock_test_results(self, repo_path: str) -> Dict[str, Any]:
+    async def _mock_test_results(self, repo_path: str, python_files: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Mock pytest results for development/testing
         Analyzes the repository and returns simulated test results
         """
-        await asyncio.sleep(1)  # Simulate test execution time
-        
         # Analyze the repository for common issues
         diagnostics = []
-        bugs_detected = []
         
         # Check for Python files
-        python_files = list(Path(repo_path).rglob("*.py"))
+        if python_files is None:
+            python_files, _ = self._enumerate(repo_path)
+        
+        # Analyze while simulating test execution time
+        _, results = await asyncio.gather(asyncio.sleep(1), _analyze_files(_mock_analyze_file, repo_path, python_files))
         
         if not python_files:
             return {
@@ -107,66 +1121,34 @@ class PytestClient:
                 "execution_time": 1.0
             }
         
-        # Analyze each Python file for common issues
-        for py_file in python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Check for common Python issues
-                if "import " in content and "from " in content:
-                    # Check for unused imports
-                    lines = content.split('\n')
-                    imports = [line for line in lines if line.strip().startswith(('import ', 'from '))]
-                    
-                    for import_line in imports:
-                        if 'import' in import_line:
-                            module_name = import_line.split('import')[1].strip().split()[0]
-                            if module_name not in content.replace(import_line, ''):
-                                diagnostics.append(f"Unused import '{module_name}' in {py_file.name}")
-                
-                # Check for syntax issues
-                if "print(" in content and "print " in content:
-                    diagnostics.append(f"Mixed print syntax in {py_file.name}")
-                
-                # Check for potential bugs
-                if "except:" in content:
-                    diagnostics.append(f"Bare except clause in {py_file.name}")
-                    bugs_detected.append("Bare except clause - should specify exception type")
-                
-                if "eval(" in content:
-                    diagnostics.append(f"Use of eval() in {py_file.name}")
-                    bugs_detected.append("Use of eval() - security risk")
-                
-                if "exec(" in content:
-                    diagnostics.append(f"Use of exec() in {py_file.name}")
-                    bugs_detected.append("Use of exec() - security risk")
-                
-                # Check for missing docstrings in functions
-                lines = content.split('\n')
-                in_function = False
-                function_name = None
-                
-                for i, line in enumerate(lines):
-                    if line.strip().startswith('def '):
-                        in_function = True
-                        function_name = line.strip().split('(')[0].replace('def ', '')
-                        # Check if next non-empty line is a docstring
-                        next_line_idx = i + 1
-                        while next_line_idx < len(lines) and not lines[next_line_idx].strip():
-                            next_line_idx += 1
-                        
-                        if (next_line_idx < len(lines) and 
-                            not lines[next_line_idx].strip().startswith('"""') and
-                            not lines[next_line_idx].strip().startswith("'''")):
-                            diagnostics.append(f"Function '{function_name}' in {py_file.name} missing docstring")
-                
-            except Exception as e:
-                diagnostics.append(f"Error analyzing {py_file.name}: {str(e)}")
+        # Failures sharing an exception type and directory (an unreadable
+        # directory, a batch of binary files) are reported once but still counted
+        bug_count = 0
+        seen_errors = set()
+        folded_errors = 0
+        for file_diagnostics, file_bugs in results:
+            bug_count += file_bugs
+            for diagnostic in file_diagnostics:
+                if diagnostic[0] == "error":
+                    if diagnostic[3:] in seen_errors:
+                        folded_errors += 1
+                        continue
+                    seen_errors.add(diagnostic[3:])
+                diagnostics.append(diagnostic)
+        
+        # Format the collected (code, *args) tuples once, outside the per-file
+        # loop, counting the messages that mention an error as they are built
+        failed_tests = bug_count + folded_errors
+        messages = []
+        for code, *args in diagnostics:
+            message = _MOCK_DIAG_FMT[code].format(*args)
+            if "error" in message.lower():
+                failed_tests += 1
+            messages.append(message)
+        diagnostics = messages
         
         # Simulate test results
         total_tests = len(python_files) * 3  # Assume 3 tests per file
-        failed_tests = len(bugs_detected) + len([d for d in diagnostics if "error" in d.lower()])
         
         return {
             "passed": failed_tests == 0,
@@ -177,68 +1159,85 @@ class PytestClient:
             "execution_time": 1.5 + len(python_files) * 0.1
         }
     
-    async def _run_pytest(self, repo_path: str) -> Optional[Dict[str, Any]]:
+    async def _probe_pytest(self) -> bool:
+        """Check if pytest is available (the warm daemon already imported it)"""
+        global _PYTEST_ON_PATH
+        if _PYTEST_DAEMON is not None:
+            return True
+        # The executable on PATH does not change under a running process, so
+        # it is probed once rather than spawned before every run
+        if _PYTEST_ON_PATH is None:
+            try:
+                await _run_subprocess(["pytest", "--version"], check=True, timeout=10)
+                _PYTEST_ON_PATH = True
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                _PYTEST_ON_PATH = False
+            except subprocess.TimeoutExpired:
+                # A slow start says nothing lasting; try again next time
+                return False
+        return _PYTEST_ON_PATH
+    
+    async def _run_pytest(self, repo_path: str, python_files: Optional[List[str]] = None,
+                          test_files: Optional[List[str]] = None,
+                          pytest_ok: Optional[bool] = None,
+                          parallel: bool = True,
+                          targets: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
-        Run pytest on the repository
+        Run pytest on the repository, or only on the given target files
         """
         try:
             print(f"Running pytest on {repo_path}")
             
-            # Check if pytest is available
-            try:
-                subprocess.run(["pytest", "--version"], 
-                             capture_output=True, check=True, timeout=10)
-            except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+            # Check if pytest is available, unless the caller already probed
+            if pytest_ok is None:
+                pytest_ok = await self._probe_pytest()
+            if not pytest_ok:
                 print("Pytest not available")
                 return None
             
             # Look for existing test files
-            test_files = []
-            for root, dirs, files in os.walk(repo_path):
-                for file in files:
-                    if (file.startswith('test_') or file.endswith('_test.py') or 
-                        'test' in file.lower() and file.endswith('.py')):
-                        test_files.append(os.path.join(root, file))
+            if test_files is None:
+                python_files, test_files = self._enumerate(repo_path)
             
             # If no test files found, try to run pytest on the main files to check for syntax errors
             if not test_files:
                 print("No test files found, running pytest on Python files for syntax checking")
-                python_files = list(Path(repo_path).rglob("*.py"))
-                if not python_files:
+                # Without an inventory, stop the walk at the first Python file
+                has_python = python_files if python_files is not None else next(_iter_py(repo_path), None)
+                if not has_python:
                     print("No Python files found")
                     return None
                 
+                # Parse the output as it is produced; the counts are only
+                # used if the collection turns out to have succeeded
+                diagnostics = []
+                collected_counts = []
+                
+                def scan(line: str) -> None:
+                    lower = line.lower()
+                    if 'test session starts' in lower:
+                        return
+                    # Extract number of collected tests
+                    collected = _COLLECTED_RE.search(line)
+                    if collected:
+                        collected_counts.append(int(collected.group(1)))
+                    elif 'error' in lower or 'failed' in lower:
+                        diagnostics.append(line.strip())
+                
                 # Run pytest with --collect-only to check for syntax errors
                 start_time = time.time()
-                result = subprocess.run(
-                    ["pytest", "--collect-only", "-q", str(repo_path)],
+                result = await self._invoke_pytest_streaming(
+                    ["--collect-only", "-q", str(repo_path)],
                     cwd=repo_path,
-                    capture_output=True,
-                    text=True,
-                    timeout=60
+                    timeout=60,
+                    on_line=scan
                 )
                 execution_time = time.time() - start_time
                 
-                # Parse the output
-                diagnostics = []
-                total_tests = 0
-                failed_tests = 0
-                
                 if result.returncode == 0:
                     # Success - count collected tests
-                    lines = result.stdout.split('\n')
-                    for line in lines:
-                        if 'test session starts' in line.lower():
-                            continue
-                        elif 'collected' in line.lower() and 'item' in line.lower():
-                            # Extract number of collected tests
-                            import re
-                            numbers = re.findall(r'\d+', line)
-                            if numbers:
-                                total_tests = int(numbers[0])
-                        elif 'error' in line.lower() or 'failed' in line.lower():
-                            diagnostics.append(line.strip())
-                            failed_tests += 1
+                    total_tests = collected_counts[-1] if collected_counts else 0
+                    failed_tests = len(diagnostics)
                     
                     return {
                         "passed": failed_tests == 0,
@@ -251,8 +1250,9 @@ class PytestClient:
                     }
                 else:
                     # Pytest found issues
-                    diagnostics = result.stderr.split('\n') if result.stderr else result.stdout.split('\n')
-                    diagnostics = [d.strip() for d in diagnostics if d.strip()]
+                    output = result.stderr or result.stdout
+                    # Limit to first 10 errors
+                    diagnostics = list(islice((d.strip() for d in _iter_lines(output) if d.strip()), 10))
                     
                     # Provide more helpful error messages
                     if "no tests collected" in result.stdout.lower():
@@ -265,7 +1265,7 @@ class PytestClient:
                         "passed": True,  # No tests is not a failure
                         "total_tests": 0,
                         "failed_tests": 0,
-                        "diagnostics": diagnostics[:10],  # Limit to first 10 errors
+                        "diagnostics": diagnostics,
                         "error_details": error_details,
                         "execution_time": execution_time,
                         "test_method": "pytest_syntax_check"
@@ -276,11 +1276,21 @@ class PytestClient:
                 print(f"Found {len(test_files)} test files, running pytest")
                 start_time = time.time()
                 
-                result = subprocess.run(
-                    ["pytest", "-v", "--tb=short", str(repo_path)],
+                # Only counts and failing test ids are parsed, so ask for the
+                # compact form: progress dots, a short summary and the totals.
+                # Workspaces are throwaway, so pytest's cache is never written
+                args = ["-q", "--no-header", "--tb=no", "-rfE", "-p", "no:cacheprovider"]
+                
+                # Spread tests across cores when pytest-xdist is installed, keeping
+                # each file on one worker so module-level fixtures are shared;
+                # below a handful of files the worker start-up costs more than it saves
+                if parallel and self.xdist_available and len(test_files) > 4:
+                    args += ["-n", str(max(1, (os.cpu_count() or 1) - 2)), "--dist=loadfile"]
+                args.extend(targets or [str(repo_path)])
+                
+                result = await self._invoke_pytest(
+                    args,
                     cwd=repo_path,
-                    capture_output=True,
-                    text=True,
                     timeout=120  # 2 minute timeout for actual tests
                 )
                 execution_time = time.time() - start_time
@@ -303,6 +1313,23 @@ class PytestClient:
             print(f"Pytest failed: {e}")
             return None
     
+    async def _invoke_pytest(self, args: List[str], cwd: str, timeout: float) -> subprocess.CompletedProcess:
+        """Run pytest through the warm daemon when possible, else as a fresh process"""
+        if _PYTEST_DAEMON is not None:
+            return await _PYTEST_DAEMON.run(args, cwd, timeout)
+        return await _run_subprocess(["pytest", *args], cwd=cwd, timeout=timeout)
+    
+    async def _invoke_pytest_streaming(self, args: List[str], cwd: str, timeout: float,
+                                       on_line: Callable[[str], None]) -> subprocess.CompletedProcess:
+        """_invoke_pytest, feeding stdout lines to on_line as they arrive"""
+        if _PYTEST_DAEMON is not None:
+            # The daemon replies with the whole transcript at once
+            result = await _PYTEST_DAEMON.run(args, cwd, timeout)
+            for line in _iter_lines(result.stdout):
+                on_line(line)
+            return result
+        return await _run_subprocess_streaming(["pytest", *args], on_line, cwd=cwd, timeout=timeout)
+    
     def _parse_pytest_output(self, result: subprocess.CompletedProcess, execution_time: float) -> Dict[str, Any]:
         """Parse pytest output into our expected format"""
         try:
@@ -310,29 +1337,22 @@ class PytestClient:
             total_tests = 0
             failed_tests = 0
             
-            # Parse stdout for test results
-            lines = result.stdout.split('\n')
-            for line in lines:
-                if '::' in line and ('PASSED' in line or 'FAILED' in line or 'ERROR' in line):
-                    total_tests += 1
-                    if 'FAILED' in line or 'ERROR' in line:
-                        failed_tests += 1
-                        # Clean up the diagnostic message
-                        clean_diagnostic = self._clean_test_diagnostic(line.strip())
-                        diagnostics.append(clean_diagnostic)
-                elif 'failed' in line.lower() and 'passed' in line.lower():
-                    # Summary line like "1 failed, 2 passed in 0.5s"
-                    import re
-                    numbers = re.findall(r'\d+', line)
-                    if len(numbers) >= 2:
-                        failed_tests = int(numbers[0])
-                        passed_tests = int(numbers[1])
-                        total_tests = failed_tests + passed_tests
+            # Parse stdout for test results, one line at a time
+            for line in _iter_lines(result.stdout):
+                entry = _SHORT_SUMMARY_RE.match(line)
+                if entry:
+                    # Clean up the diagnostic message, given as "test_id STATUS"
+                    clean_diagnostic = self._clean_test_diagnostic(f"{entry.group(2)} {entry.group(1)}")
+                    diagnostics.append(clean_diagnostic)
+                elif _FINAL_LINE_RE.search(line):
+                    # Summary line like "1 failed, 2 passed, 1 error in 0.5s"
+                    outcomes = {outcome: int(count) for count, outcome in _OUTCOME_RE.findall(line)}
+                    failed_tests = outcomes.get('failed', 0) + outcomes.get('error', 0)
+                    total_tests = failed_tests + outcomes.get('passed', 0)
             
             # If no tests found in stdout, check stderr
             if total_tests == 0 and result.stderr:
-                stderr_lines = result.stderr.split('\n')
-                for line in stderr_lines:
+                for line in _iter_lines(result.stderr):
                     if 'error' in line.lower() or 'failed' in line.lower():
                         clean_diagnostic = self._clean_test_diagnostic(line.strip())
                         diagnostics.append(clean_diagnostic)
@@ -355,10 +1375,11 @@ class PytestClient:
                     # Try to extract more information from stderr
                     error_details = result.stderr or result.stdout or "Unknown pytest error"
                     diagnostics = []
-                    if result.stderr:
-                        diagnostics.extend([self._clean_test_diagnostic(line.strip()) for line in result.stderr.split('\n') if line.strip()][:5])
-                    if result.stdout:
-                        diagnostics.extend([self._clean_test_diagnostic(line.strip()) for line in result.stdout.split('\n') if line.strip()][:5])
+                    # Only the first five non-blank lines of each stream are cleaned
+                    for output in (result.stderr, result.stdout):
+                        if output:
+                            lines = (line.strip() for line in _iter_lines(output) if line.strip())
+                            diagnostics.extend(self._clean_test_diagnostic(line) for line in islice(lines, 5))
                     
                     return {
                         "passed": False,
@@ -395,49 +1416,27 @@ class PytestClient:
                 "test_method": "pytest_parse_error"
             }
 
-    async def _run_static_analysis(self, repo_path: str) -> Dict[str, Any]:
+    async def _run_static_analysis(self, repo_path: str, python_files: Optional[List[str]] = None) -> Dict[str, Any]:
         """Fallback static analysis when pytest fails"""
         try:
-            import ast
-            import re
-            
             diagnostics = []
             total_tests = 0
             failed_tests = 0
             
             # Walk through Python files in the repository
-            for root, dirs, files in os.walk(repo_path):
-                for file in files:
-                    if file.endswith('.py'):
-                        file_path = os.path.join(root, file)
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                            
-                            # Parse the AST
-                            try:
-                                tree = ast.parse(content)
-                            except SyntaxError as e:
-                                diagnostics.append(f"Syntax error in {file}: {e}")
-                                failed_tests += 1
-                                total_tests += 1
-                                continue
-                            
-                            # Check for various issues
-                            issues = self._analyze_ast_for_issues(tree, file)
-                            diagnostics.extend(issues)
-                            failed_tests += len(issues)
-                            total_tests += 1
-                            
-                            # Also check for patterns in the raw content
-                            pattern_issues = self._analyze_content_patterns(content, file)
-                            diagnostics.extend(pattern_issues)
-                            failed_tests += len(pattern_issues)
-                            
-                        except Exception as e:
-                            diagnostics.append(f"Error analyzing {file}: {e}")
-                            failed_tests += 1
-                            total_tests += 1
+            if python_files is None:
+                python_files, _ = self._enumerate(repo_path)
+            
+            results = await _analyze_files(_analyze_file_worker, repo_path, python_files)
+            
+            # Counts cover every issue, but only the first MAX_STATIC_DIAGNOSTICS are kept
+            room = MAX_STATIC_DIAGNOSTICS
+            for issues, failed in results:
+                if room > 0:
+                    diagnostics.extend(issues[:room])
+                    room = MAX_STATIC_DIAGNOSTICS - len(diagnostics)
+                failed_tests += failed
+                total_tests += 1
             
             return {
                 "passed": failed_tests == 0,
@@ -459,53 +1458,14 @@ class PytestClient:
                 "execution_time": 0.0
             }
     
-    def _analyze_ast_for_issues(self, tree: ast.AST, filename: str) -> List[str]:
-        """Analyze AST for common issues"""
-        issues = []
-        
-        class IssueVisitor(ast.NodeVisitor):
-            def visit_Import(self, node):
-                # Check for unused imports (simplified check)
-                for alias in node.names:
-                    if alias.name == 'datetime' and 'datetime' not in str(tree):
-                        issues.append(f"Unused import 'datetime' in {filename}")
-                self.generic_visit(node)
-            
-            def visit_ExceptHandler(self, node):
-                if node.type is None:
-                    issues.append(f"Bare except clause in {filename} (line {node.lineno})")
-                self.generic_visit(node)
-            
-            def visit_Call(self, node):
-                if isinstance(node.func, ast.Name):
-                    if node.func.id == 'eval':
-                        issues.append(f"Use of eval() detected in {filename} (line {node.lineno}) - security risk")
-                    elif node.func.id == 'exec':
-                        issues.append(f"Use of exec() detected in {filename} (line {node.lineno}) - security risk")
-                self.generic_visit(node)
-            
-            def visit_FunctionDef(self, node):
-                # Check for missing docstrings
-                if not ast.get_docstring(node) and not node.name.startswith('_'):
-                    issues.append(f"Function '{node.name}' in {filename} missing docstring")
-                
-                # Check for missing type hints
-                if node.returns is None and not node.name.startswith('_'):
-                    issues.append(f"Function '{node.name}' in {filename} missing return type hint")
-                
-                self.generic_visit(node)
-        
-        visitor = IssueVisitor()
-        visitor.visit(tree)
-        return issues
-    
     async def _generate_and_run_tests(self, repo_path: str) -> Optional[Dict[str, Any]]:
         """Generate hardcoded general tests and then run them"""
         try:
             print(f"Generating tests for repository: {repo_path}")
             
-            # Create hardcoded general tests
-            test_files = self._create_hardcoded_tests(repo_path)
+            # Create hardcoded general tests; the file writes run in a worker
+            # thread so other jobs on the event loop keep going meanwhile
+            test_files = await asyncio.to_thread(self._create_hardcoded_tests, repo_path)
             
             if not test_files:
                 print("Failed to create hardcoded test files")
@@ -515,7 +1475,13 @@ class PytestClient:
             
             # Now run the generated tests
             print("Running generated hardcoded tests...")
-            result = await self._run_pytest(repo_path)
+            # The generated files are the test inventory, so no re-walk is needed
+            # and run_tests only generates after pytest itself has run. Naming the
+            # files also spares pytest from walking the repository to collect them.
+            # The generated tests share one cached walk/read/parse of the
+            # repository, which only pays off in one process, so xdist stays off
+            result = await self._run_pytest(repo_path, test_files=test_files, pytest_ok=True,
+                                            parallel=False, targets=test_files)
             
             if result:
                 print(f"✅  tests completed: {result.get('total_tests', 0)} tests, {result.get('failed_tests', 0)} failed")
@@ -540,14 +1506,104 @@ class PytestClient:
         
         test_files = []
         
+        # Shared helper imported by the generated tests (not a test itself)
+        helper_content = '''"""Repository files, sources and ASTs shared by the generated tests."""
+import ast
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Vendored, virtualenv and build directories are pruned whole instead of
+# filtering every path below them
+_SKIP_DIRS = {
+    ".git", "__pycache__", ".venv", "venv", "node_modules",
+    ".tox", "dist", "build", ".pytest_cache", ".mypy_cache", "site-packages"
+}
+
+# Repositories with at least this many files have them read concurrently up front
+_PREFETCH_MIN_FILES = 64
+
+
+def iter_py_files(root=REPO_PATH):
+    """Yield the non-test .py files under root."""
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if "test" in entry.name:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file(follow_symlinks=False):
+                    yield entry.path
+
+
+# Every test module scans the same files, so the walk, the reads and the
+# parses are each done once per process and shared through these caches
+
+@functools.lru_cache(maxsize=None)
+def py_files():
+    """Return the non-test .py files of the repository."""
+    files = tuple(iter_py_files())
+    if len(files) >= _PREFETCH_MIN_FILES:
+        # Reads release the GIL, so threads overlap them; parsing does not,
+        # and ASTs cost as much to pickle back from a process as to build
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            for _ in pool.map(_prefetch, files):
+                pass
+    return files
+
+
+def _prefetch(path):
+    """Warm the read cache; errors surface again when a test reads the file."""
+    try:
+        read_bytes(path)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def read_bytes(path):
+    """Return the raw bytes of a source file."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=None)
+def read_source(path):
+    """Return the text of a source file, with newlines translated as open() would."""
+    data = read_bytes(path).decode('utf-8')
+    if '\\r' in data:
+        data = data.replace('\\r\\n', '\\n').replace('\\r', '\\n')
+    return data
+
+
+@functools.lru_cache(maxsize=None)
+def parse_source(path):
+    """Return the parsed AST of a source file; raises SyntaxError if it does not parse."""
+    # The parser decodes the bytes itself, so AST-only checks never need the text
+    return ast.parse(read_bytes(path), filename=path)
+'''
+        _write_if_changed(os.path.join(test_dir, "_repo_files.py"), helper_content)
+        
         # Test 1: Basic functionality test
         test_1_content = '''import unittest
 import sys
 import os
-from pathlib import Path
+
+# Shared repository scan helpers live next to the generated tests
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _repo_files import REPO_PATH, py_files, parse_source
 
 # Add the parent directory to the path to import modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, REPO_PATH)
 
 class TestBasicFunctionality(unittest.TestCase):
     """Test basic functionality of the codebase."""
@@ -565,23 +1621,19 @@ class TestBasicFunctionality(unittest.TestCase):
     
     def test_python_files_exist(self):
         """Test that Python files exist in the repository."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        # Exclude test files and __pycache__
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         self.assertGreater(len(python_files), 0, "No Python files found in repository")
     
     def test_no_syntax_errors(self):
         """Test that Python files have no syntax errors."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                compile(content, str(py_file), 'exec')
+                # Compile the shared AST: the parse is reused, and the compiler
+                # still reports what the parser alone accepts ('return' outside
+                # a function and the like)
+                compile(parse_source(py_file), str(py_file), 'exec')
             except SyntaxError as e:
                 self.fail(f"Syntax error in {py_file}: {e}")
 
@@ -590,54 +1642,61 @@ if __name__ == '__main__':
 '''
         
         test_1_path = os.path.join(test_dir, "test_basic_functionality.py")
-        with open(test_1_path, 'w', encoding='utf-8') as f:
-            f.write(test_1_content)
+        _write_if_changed(test_1_path, test_1_content)
         test_files.append(test_1_path)
         
         # Test 2: Code quality test
         test_2_content = '''import unittest
 import ast
+import functools
 import os
-from pathlib import Path
+import sys
+
+# Shared repository scan helpers live next to the generated tests
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _repo_files import py_files, parse_source
+
+
+@functools.lru_cache(maxsize=None)
+def _quality_findings(py_file):
+    """Walk a file's AST once, returning the lines of its first bare except and eval() call."""
+    bare_except = eval_call = None
+    for node in ast.walk(parse_source(py_file)):
+        if bare_except is None and isinstance(node, ast.ExceptHandler) and node.type is None:
+            bare_except = node.lineno
+        elif eval_call is None and isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            if node.func.id == 'eval':
+                eval_call = node.lineno
+        if bare_except is not None and eval_call is not None:
+            break
+    return bare_except, eval_call
+
 
 class TestCodeQuality(unittest.TestCase):
     """Test code quality and best practices."""
     
     def test_no_bare_except(self):
         """Test that there are no bare except clauses."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                tree = ast.parse(content)
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.ExceptHandler) and node.type is None:
-                        self.fail(f"Bare except clause found in {py_file} at line {node.lineno}")
+                lineno = _quality_findings(py_file)[0]
+                if lineno is not None:
+                    self.fail(f"Bare except clause found in {py_file} at line {lineno}")
             except SyntaxError:
                 # Skip files with syntax errors (handled by other tests)
                 pass
     
     def test_no_eval_usage(self):
         """Test that eval() is not used (security risk)."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                tree = ast.parse(content)
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-                        if node.func.id == 'eval':
-                            self.fail(f"eval() usage found in {py_file} at line {node.lineno} - security risk")
+                lineno = _quality_findings(py_file)[1]
+                if lineno is not None:
+                    self.fail(f"eval() usage found in {py_file} at line {lineno} - security risk")
             except SyntaxError:
                 pass
 
@@ -646,55 +1705,38 @@ if __name__ == '__main__':
 '''
         
         test_2_path = os.path.join(test_dir, "test_code_quality.py")
-        with open(test_2_path, 'w', encoding='utf-8') as f:
-            f.write(test_2_content)
+        _write_if_changed(test_2_path, test_2_content)
         test_files.append(test_2_path)
         
         # Test 3: Error handling test
         test_3_content = '''import unittest
 import os
-from pathlib import Path
+import re
+import sys
+
+# Shared repository scan helpers live next to the generated tests
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _repo_files import py_files, read_bytes
+
+# A "global " statement, ignoring indentation, with something after it; only
+# counted, so it runs on the raw bytes without decoding the file
+_GLOBAL_RE = re.compile(rb'^[^\\S\\n]*global [^\\n]*\\S', re.MULTILINE)
 
 class TestErrorHandling(unittest.TestCase):
     """Test error handling patterns."""
     
     def test_files_have_error_handling(self):
         """Test that files have some form of error handling."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
-        
-        files_with_error_handling = 0
-        for py_file in python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                if 'try:' in content or 'except' in content or 'raise' in content:
-                    files_with_error_handling += 1
-            except Exception:
-                pass
-        
-        # At least 50% of files should have some error handling
-        if len(python_files) > 0:
-            error_handling_ratio = files_with_error_handling / len(python_files)
-            self.assertGreaterEqual(error_handling_ratio, 0.0, 
-                                  f"Only {error_handling_ratio:.1%} of files have error handling")
+        # Informational only: every ratio passes, so the files are not scanned
     
     def test_no_global_variables(self):
         """Test that global variables are used minimally."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         global_count = 0
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                lines = content.split('\\n')
-                for line in lines:
-                    if line.strip().startswith('global '):
-                        global_count += 1
+                global_count += len(_GLOBAL_RE.findall(read_bytes(py_file)))
             except Exception:
                 pass
         
@@ -706,55 +1748,55 @@ if __name__ == '__main__':
 '''
         
         test_3_path = os.path.join(test_dir, "test_error_handling.py")
-        with open(test_3_path, 'w', encoding='utf-8') as f:
-            f.write(test_3_content)
+        _write_if_changed(test_3_path, test_3_content)
         test_files.append(test_3_path)
         
         # Test 4: Performance test
         test_4_content = '''import unittest
 import time
 import os
-from pathlib import Path
+import re
+import sys
+
+# Shared repository scan helpers live next to the generated tests
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _repo_files import py_files, read_bytes, read_source
+
+# A line that starts (after indentation) with "while True:"
+_WHILE_TRUE_RE = re.compile(r'^[^\\S\\n]*while True:', re.MULTILINE)
 
 class TestPerformance(unittest.TestCase):
     """Test performance-related issues."""
     
     def test_no_infinite_loops(self):
         """Test that there are no obvious infinite loops."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                lines = content.split('\\n')
+                content = read_source(py_file)
+                lines = None
                 
-                for i, line in enumerate(lines):
-                    stripped = line.strip()
-                    # Check for while True without break/return
-                    if stripped.startswith('while True:'):
-                        # Look ahead for break or return in the next 20 lines
-                        has_break = False
-                        for j in range(i+1, min(i+21, len(lines))):
-                            if 'break' in lines[j] or 'return' in lines[j]:
-                                has_break = True
-                                break
-                        if not has_break:
-                            self.fail(f"Potential infinite loop in {py_file} at line {i+1}")
+                # Check for while True without break/return
+                for match in _WHILE_TRUE_RE.finditer(content):
+                    if lines is None:
+                        lines = content.split('\\n')
+                    i = content.count('\\n', 0, match.start())
+                    # Look ahead for break or return in the next 20 lines
+                    if not any('break' in line or 'return' in line for line in lines[i+1:i+21]):
+                        self.fail(f"Potential infinite loop in {py_file} at line {i+1}")
             except Exception:
                 pass
     
     def test_file_sizes_reasonable(self):
         """Test that Python files are not excessively large."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         for py_file in python_files:
             try:
-                file_size = py_file.stat().st_size
+                # The other tests read every file anyway, so the cached bytes
+                # give the size without another stat() call
+                file_size = len(read_bytes(py_file))
                 # Flag files larger than 1MB
                 self.assertLess(file_size, 1024*1024, 
                               f"File {py_file} is too large: {file_size} bytes")
@@ -766,59 +1808,63 @@ if __name__ == '__main__':
 '''
         
         test_4_path = os.path.join(test_dir, "test_performance.py")
-        with open(test_4_path, 'w', encoding='utf-8') as f:
-            f.write(test_4_content)
+        _write_if_changed(test_4_path, test_4_content)
         test_files.append(test_4_path)
         
         # Test 5: Security test
         test_5_content = '''import unittest
 import os
-from pathlib import Path
+import re
+import sys
+
+# Shared repository scan helpers live next to the generated tests
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _repo_files import py_files, read_source
+
+# An uncommented line assigning something secret-looking, unless it mentions
+# test/example/dummy/placeholder ("api_key=" is covered by "key=")
+_SECRET_RE = re.compile(
+    r'^(?![^\\S\\n]*#)(?=.*(?:password|secret|token|key)=)(?!.*(?:test|example|dummy|placeholder)).*',
+    re.MULTILINE | re.IGNORECASE
+)
+# A line building a SELECT/INSERT/UPDATE with "+", unless it mentions test/example/mock
+_SQL_CONCAT_RE = re.compile(
+    r'^(?=.*\\+)(?=(?i:.*(?:select|insert|update)))(?!.*(?:test|example|mock)).*',
+    re.MULTILINE
+)
 
 class TestSecurity(unittest.TestCase):
     """Test security-related issues."""
     
     def test_no_hardcoded_secrets(self):
         """Test that there are no obvious hardcoded secrets."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
-        
-        secret_patterns = ['password=', 'secret=', 'api_key=', 'token=', 'key=']
+        python_files = py_files()
         
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                lines = content.split('\\n')
+                content = read_source(py_file)
                 
-                for i, line in enumerate(lines):
-                    line_lower = line.lower()
-                    for pattern in secret_patterns:
-                        if pattern in line_lower and not line.strip().startswith('#'):
-                            # Check if it's not a comment or test
-                            if not any(keyword in line_lower for keyword in ['test', 'example', 'dummy', 'placeholder']):
-                                self.fail(f"Potential hardcoded secret in {py_file} at line {i+1}: {line.strip()}")
+                # One scan over the whole file instead of every pattern on every line
+                match = _SECRET_RE.search(content)
+                if match:
+                    line_number = content.count('\\n', 0, match.start()) + 1
+                    self.fail(f"Potential hardcoded secret in {py_file} at line {line_number}: {match.group().strip()}")
             except Exception:
                 pass
     
     def test_no_sql_injection_patterns(self):
         """Test for potential SQL injection patterns."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                lines = content.split('\\n')
+                content = read_source(py_file)
                 
-                for i, line in enumerate(lines):
-                    # Look for string concatenation in SQL queries
-                    if ('SELECT' in line.upper() or 'INSERT' in line.upper() or 'UPDATE' in line.upper()) and '+' in line:
-                        if not any(keyword in line for keyword in ['test', 'example', 'mock']):
-                            self.fail(f"Potential SQL injection in {py_file} at line {i+1}: {line.strip()}")
+                # Look for string concatenation in SQL queries
+                match = _SQL_CONCAT_RE.search(content)
+                if match:
+                    line_number = content.count('\\n', 0, match.start()) + 1
+                    self.fail(f"Potential SQL injection in {py_file} at line {line_number}: {match.group().strip()}")
             except Exception:
                 pass
 
@@ -827,104 +1873,50 @@ if __name__ == '__main__':
 '''
         
         test_5_path = os.path.join(test_dir, "test_security.py")
-        with open(test_5_path, 'w', encoding='utf-8') as f:
-            f.write(test_5_content)
+        _write_if_changed(test_5_path, test_5_content)
         test_files.append(test_5_path)
         
         # Test 6: Documentation test
         test_6_content = '''import unittest
-import ast
-import os
-from pathlib import Path
 
 class TestDocumentation(unittest.TestCase):
     """Test documentation and code structure."""
     
     def test_functions_have_docstrings(self):
         """Test that functions have docstrings."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
-        
-        functions_without_docstrings = 0
-        total_functions = 0
-        
-        for py_file in python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                tree = ast.parse(content)
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef) and not node.name.startswith('_'):
-                        total_functions += 1
-                        if not ast.get_docstring(node):
-                            functions_without_docstrings += 1
-            except SyntaxError:
-                pass
-        
-        if total_functions > 0:
-            docstring_ratio = (total_functions - functions_without_docstrings) / total_functions
-            self.assertGreaterEqual(docstring_ratio, 0.0, 
-                                  f"Only {docstring_ratio:.1%} of functions have docstrings")
+        # Informational only: every ratio passes, so the files are not scanned
     
     def test_classes_have_docstrings(self):
         """Test that classes have docstrings."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
-        
-        classes_without_docstrings = 0
-        total_classes = 0
-        
-        for py_file in python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                tree = ast.parse(content)
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.ClassDef) and not node.name.startswith('_'):
-                        total_classes += 1
-                        if not ast.get_docstring(node):
-                            classes_without_docstrings += 1
-            except SyntaxError:
-                pass
-        
-        if total_classes > 0:
-            docstring_ratio = (total_classes - classes_without_docstrings) / total_classes
-            self.assertGreaterEqual(docstring_ratio, 0.0, 
-                                  f"Only {docstring_ratio:.1%} of classes have docstrings")
+        # Informational only: every ratio passes, so the files are not scanned
 
 if __name__ == '__main__':
     unittest.main()
 '''
         
         test_6_path = os.path.join(test_dir, "test_documentation.py")
-        with open(test_6_path, 'w', encoding='utf-8') as f:
-            f.write(test_6_content)
+        _write_if_changed(test_6_path, test_6_content)
         test_files.append(test_6_path)
         
         # Test 7: Import test
         test_7_content = '''import unittest
-import ast
 import os
-from pathlib import Path
+import sys
+
+# Shared repository scan helpers live next to the generated tests
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _repo_files import py_files, read_source, parse_source
 
 class TestImports(unittest.TestCase):
     """Test import statements and dependencies."""
     
     def test_imports_are_valid(self):
         """Test that import statements are valid."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                tree = ast.parse(content)
+                tree = parse_source(py_file)
                 
                 # If we can parse it, imports are syntactically valid
                 self.assertTrue(True, f"Imports in {py_file} are valid")
@@ -933,18 +1925,15 @@ class TestImports(unittest.TestCase):
     
     def test_no_circular_imports(self):
         """Test for potential circular import patterns."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         # Simple check for obvious circular imports
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = read_source(py_file)
                 
                 # Look for imports of the same module name
-                filename = py_file.stem
+                filename = os.path.splitext(os.path.basename(py_file))[0]
                 if f"import {filename}" in content or f"from {filename}" in content:
                     self.fail(f"Potential circular import in {py_file}")
             except Exception:
@@ -955,85 +1944,81 @@ if __name__ == '__main__':
 '''
         
         test_7_path = os.path.join(test_dir, "test_imports.py")
-        with open(test_7_path, 'w', encoding='utf-8') as f:
-            f.write(test_7_content)
+        _write_if_changed(test_7_path, test_7_content)
         test_files.append(test_7_path)
         
         # Test 8: Data structure test
         test_8_content = '''import unittest
 import os
-from pathlib import Path
+import re
+import sys
+
+# Shared repository scan helpers live next to the generated tests
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _repo_files import py_files, read_source
+
+# A "def " line with a "=[]" or "={}" default, unless it mentions test/example/mock
+_MUTABLE_DEFAULT_RE = re.compile(
+    r'^(?=.*def )(?=.*=(?:\\[\\]|\\{\\}))(?!.*(?:test|example|mock)).*',
+    re.MULTILINE
+)
 
 class TestDataStructures(unittest.TestCase):
     """Test data structure usage and patterns."""
     
     def test_no_mutable_default_arguments(self):
         """Test that functions don't use mutable default arguments."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                lines = content.split('\\n')
+                content = read_source(py_file)
                 
-                for i, line in enumerate(lines):
-                    # Look for function definitions with mutable defaults
-                    if 'def ' in line and ('=[]' in line or '={}' in line):
-                        if not any(keyword in line for keyword in ['test', 'example', 'mock']):
-                            self.fail(f"Mutable default argument in {py_file} at line {i+1}: {line.strip()}")
+                # Look for function definitions with mutable defaults
+                match = _MUTABLE_DEFAULT_RE.search(content)
+                if match:
+                    line_number = content.count('\\n', 0, match.start()) + 1
+                    self.fail(f"Mutable default argument in {py_file} at line {line_number}: {match.group().strip()}")
             except Exception:
                 pass
     
     def test_proper_list_usage(self):
         """Test that lists are used appropriately."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
-        
-        for py_file in python_files:
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Check for inefficient list operations
-                if '.append(' in content and content.count('.append(') > 10:
-                    # This is just a warning, not a failure
-                    print(f"Warning: Many list append operations in {py_file}")
-            except Exception:
-                pass
+        # Informational only: it never fails, so the files are not scanned
 
 if __name__ == '__main__':
     unittest.main()
 '''
         
         test_8_path = os.path.join(test_dir, "test_data_structures.py")
-        with open(test_8_path, 'w', encoding='utf-8') as f:
-            f.write(test_8_content)
+        _write_if_changed(test_8_path, test_8_content)
         test_files.append(test_8_path)
         
         # Test 9: Configuration test
         test_9_content = '''import unittest
 import os
-from pathlib import Path
+import re
+import sys
+
+# Shared repository scan helpers live next to the generated tests
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _repo_files import REPO_PATH, py_files, read_bytes
+
+# Only tested for presence, so it runs on the raw bytes without decoding the file
+_ENV_USAGE_RE = re.compile(rb'os\\.(?:getenv|environ)')
+_CONFIG_FILES = ('requirements.txt', 'setup.py', 'pyproject.toml', 'Pipfile')
 
 class TestConfiguration(unittest.TestCase):
     """Test configuration and environment setup."""
     
     def test_environment_variables_used(self):
         """Test that environment variables are used for configuration."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         has_env_usage = False
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                if 'os.getenv' in content or 'os.environ' in content:
+                if _ENV_USAGE_RE.search(read_bytes(py_file)):
                     has_env_usage = True
                     break
             except Exception:
@@ -1047,14 +2032,8 @@ class TestConfiguration(unittest.TestCase):
     
     def test_config_files_exist(self):
         """Test that common config files exist."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        config_files = ['requirements.txt', 'setup.py', 'pyproject.toml', 'Pipfile']
-        found_configs = []
-        
-        for config_file in config_files:
-            if (Path(repo_path) / config_file).exists():
-                found_configs.append(config_file)
+        found_configs = [config_file for config_file in _CONFIG_FILES
+                         if os.path.exists(os.path.join(REPO_PATH, config_file))]
         
         # This is informational, not a failure
         if found_configs:
@@ -1067,41 +2046,34 @@ if __name__ == '__main__':
 '''
         
         test_9_path = os.path.join(test_dir, "test_configuration.py")
-        with open(test_9_path, 'w', encoding='utf-8') as f:
-            f.write(test_9_content)
+        _write_if_changed(test_9_path, test_9_content)
         test_files.append(test_9_path)
         
         # Test 10: Integration test
         test_10_content = '''import unittest
 import os
 import sys
-from pathlib import Path
+
+# Shared repository scan helpers live next to the generated tests
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _repo_files import py_files, parse_source, read_source
 
 class TestIntegration(unittest.TestCase):
     """Test integration and overall system health."""
     
     def test_main_modules_can_be_imported(self):
         """Test that main modules can be imported without errors."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
-        
-        # Add repo to path
-        if repo_path not in sys.path:
-            sys.path.insert(0, repo_path)
+        python_files = py_files()
         
         imported_modules = 0
         for py_file in python_files:
             try:
-                module_name = py_file.stem
+                module_name = os.path.splitext(os.path.basename(py_file))[0]
                 if module_name != '__init__':
-                    # Try to import the module
-                    try:
-                        __import__(module_name)
-                        imported_modules += 1
-                    except ImportError:
-                        # Some modules might not be importable (scripts, etc.)
-                        pass
+                    # Parse the module instead of importing it so repository
+                    # code never runs inside the test process
+                    parse_source(py_file)
+                    imported_modules += 1
             except Exception:
                 pass
         
@@ -1110,9 +2082,7 @@ class TestIntegration(unittest.TestCase):
     
     def test_no_obvious_errors(self):
         """Test that there are no obvious runtime errors."""
-        repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        python_files = list(Path(repo_path).rglob("*.py"))
-        python_files = [f for f in python_files if "test" not in str(f) and "__pycache__" not in str(f)]
+        python_files = py_files()
         
         # This is a basic sanity check
         self.assertGreater(len(python_files), 0, "No Python files found")
@@ -1120,8 +2090,7 @@ class TestIntegration(unittest.TestCase):
         # Check that files are readable
         for py_file in python_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = read_source(py_file)
                 self.assertIsInstance(content, str, f"Could not read {py_file}")
             except Exception as e:
                 self.fail(f"Error reading {py_file}: {e}")
@@ -1131,8 +2100,7 @@ if __name__ == '__main__':
 '''
         
         test_10_path = os.path.join(test_dir, "test_integration.py")
-        with open(test_10_path, 'w', encoding='utf-8') as f:
-            f.write(test_10_content)
+        _write_if_changed(test_10_path, test_10_content)
         test_files.append(test_10_path)
         
         return test_files
@@ -1140,108 +2108,34 @@ if __name__ == '__main__':
     def _clean_test_diagnostic(self, diagnostic: str) -> str:
         """Clean up test diagnostic messages to make them more readable"""
         try:
-            # Remove long temporary paths and keep only the relevant parts
-            import re
-            
             # Extract test file name and test method from the diagnostic
             # Pattern: /long/path/to/tests/test_file.py::TestClass::test_method FAILED
-            test_pattern = r'.*/(tests/[^/]+\.py)::([^:]+)::([^:]+)\s+(FAILED|ERROR|PASSED)'
-            match = re.search(test_pattern, diagnostic)
+            match = _TEST_RESULT_RE.search(diagnostic)
             
             if match:
                 test_file = match.group(1)  # tests/test_file.py
-                test_class = match.group(2)  # TestClass
                 test_method = match.group(3)  # test_method
-                status = match.group(4)  # FAILED/ERROR/PASSED
                 
                 # Create a very short, concise message for UI display
-                if "test_basic_functionality" in test_file:
-                    if "test_python_files_exist" in test_method:
-                        clean_message = "No Python files found"
-                    elif "test_no_syntax_errors" in test_method:
-                        clean_message = "Syntax errors detected"
-                    elif "test_imports_work" in test_method:
-                        clean_message = "Import errors"
-                    else:
-                        clean_message = "Basic functionality issues"
-                elif "test_code_quality" in test_file:
-                    if "test_no_bare_except" in test_method:
-                        clean_message = "Bare except clauses"
-                    elif "test_no_eval_usage" in test_method:
-                        clean_message = "eval() usage (security risk)"
-                    else:
-                        clean_message = "Code quality issues"
-                elif "test_security" in test_file:
-                    if "test_no_hardcoded_secrets" in test_method:
-                        clean_message = "Hardcoded secrets"
-                    elif "test_no_sql_injection_patterns" in test_method:
-                        clean_message = "SQL injection risk"
-                    else:
-                        clean_message = "Security issues"
-                elif "test_performance" in test_file:
-                    if "test_no_infinite_loops" in test_method:
-                        clean_message = "Infinite loops"
-                    elif "test_file_sizes_reasonable" in test_method:
-                        clean_message = "Files too large"
-                    else:
-                        clean_message = "Performance issues"
-                elif "test_documentation" in test_file:
-                    if "test_functions_have_docstrings" in test_method:
-                        clean_message = "Missing docstrings"
-                    elif "test_classes_have_docstrings" in test_method:
-                        clean_message = "Missing class docs"
-                    else:
-                        clean_message = "Documentation issues"
-                elif "test_error_handling" in test_file:
-                    if "test_files_have_error_handling" in test_method:
-                        clean_message = "Poor error handling"
-                    elif "test_no_global_variables" in test_method:
-                        clean_message = "Too many globals"
-                    else:
-                        clean_message = "Error handling issues"
-                elif "test_imports" in test_file:
-                    if "test_imports_are_valid" in test_method:
-                        clean_message = "Invalid imports"
-                    elif "test_no_circular_imports" in test_method:
-                        clean_message = "Circular imports"
-                    else:
-                        clean_message = "Import issues"
-                elif "test_data_structures" in test_file:
-                    if "test_no_mutable_default_arguments" in test_method:
-                        clean_message = "Mutable defaults"
-                    else:
-                        clean_message = "Data structure issues"
-                elif "test_configuration" in test_file:
-                    clean_message = "Configuration issues"
-                elif "test_integration" in test_file:
-                    if "test_main_modules_can_be_imported" in test_method:
-                        clean_message = "Module import issues"
-                    elif "test_no_obvious_errors" in test_method:
-                        clean_message = "Runtime errors"
-                    else:
-                        clean_message = "Integration issues"
+                category = _TEST_CATEGORY_RE.search(test_file)
+                if category:
+                    default_message, method_messages = _TEST_CATEGORY_MESSAGES[category.group()]
+                    cleaned = method_messages.get(test_method, default_message)
                 else:
-                    clean_message = f"{test_file} - {test_method}"
-                
-                return clean_message
+                    cleaned = f"{test_file} - {test_method}"
             else:
                 # If we can't parse it, just clean up the path
                 # Remove long temporary paths and make it more readable
                 cleaned = diagnostic
                 
-                # Remove long temporary paths
-                cleaned = re.sub(r'/var/folders/[^/]+/', '', cleaned)
-                cleaned = re.sub(r'/tmp/[^/]+/', '', cleaned)
-                cleaned = re.sub(r'/.*?/tests/', 'tests/', cleaned)
-                
-                # Clean up multiple dots and slashes
-                cleaned = re.sub(r'\.\.+', '..', cleaned)
-                cleaned = re.sub(r'//+', '/', cleaned)
+                # Remove long temporary paths, then clean up multiple dots and slashes
+                for pattern, replacement in _TEMP_PATH_RES:
+                    cleaned = pattern.sub(replacement, cleaned)
                 
                 # If it's still a long path, try to extract just the test name
                 if len(cleaned) > 50:
                     # Try to extract test file and method from long paths
-                    simple_match = re.search(r'tests/([^/]+\.py)::([^:]+)::([^:]+)', cleaned)
+                    simple_match = _TEST_ID_RE.search(cleaned)
                     if simple_match:
                         test_file = simple_match.group(1)
                         test_method = simple_match.group(3)
@@ -1252,9 +2146,7 @@ if __name__ == '__main__':
                         last_part = cleaned.split('/')[-1] if '/' in cleaned else cleaned
                         cleaned = last_part.replace('test_', '').replace('_', ' ').title()[:30]
                 
-                return cleaned
-                
-        except Exception as e:
+        except Exception:
             # If cleaning fails, return the original diagnostic
             return diagnostic
         
@@ -1286,18 +2178,8 @@ if __name__ == '__main__':
         }
         
         for diagnostic in diagnostics:
-            if "security" in diagnostic.lower() or "eval" in diagnostic.lower() or "secret" in diagnostic.lower():
-                categories["Security Issues"] += 1
-            elif "code_quality" in diagnostic.lower() or "bare except" in diagnostic.lower():
-                categories["Code Quality"] += 1
-            elif "documentation" in diagnostic.lower() or "docstring" in diagnostic.lower():
-                categories["Documentation"] += 1
-            elif "error_handling" in diagnostic.lower() or "global" in diagnostic.lower():
-                categories["Error Handling"] += 1
-            elif "performance" in diagnostic.lower() or "infinite" in diagnostic.lower():
-                categories["Performance"] += 1
-            else:
-                categories["Other Issues"] += 1
+            category = _SUMMARY_CATEGORY_RE.match(diagnostic)
+            categories[_SUMMARY_CATEGORIES[category.lastgroup] if category else "Other Issues"] += 1
         
         # Create concise summary
         if failed_tests == 0:
@@ -1313,27 +2195,3 @@ if __name__ == '__main__':
             summary_parts.append(f"{category}: {count}")
         
         return " | ".join(summary_parts)
-    
-    def _analyze_content_patterns(self, content: str, filename: str) -> List[str]:
-        """Analyze content for patterns that indicate issues"""
-        issues = []
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # Check for hardcoded paths
-            if '/tmp/' in line or '/var/' in line:
-                issues.append(f"Hardcoded path detected in {filename} (line {i}): {line.strip()}")
-            
-            # Check for Python 2 style print statements
-            if re.search(r'\bprint\s+[^(]', line):
-                issues.append(f"Python 2 style print statement in {filename} (line {i}): {line.strip()}")
-            
-            # Check for global variables
-            if line.strip().startswith('global '):
-                issues.append(f"Global variable usage in {filename} (line {i}): {line.strip()}")
-            
-            # Check for resource leaks (open without close)
-            if 'open(' in line and 'with ' not in line and 'close()' not in content:
-                issues.append(f"Potential resource leak in {filename} (line {i}): file opened without proper cleanup")
-        
-        return issues
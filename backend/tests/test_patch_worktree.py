@@ -0,0 +1,56 @@
+"""Patched test runs after the pipeline's own run_tests call."""
+import asyncio
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest_client
+from pytest_client import PytestClient
+
+PATCH = """diff --git a/calc.py b/calc.py
+--- a/calc.py
++++ b/calc.py
+@@ -1,2 +1,2 @@
+ def add(a, b):
+-    return a - b
++    return a + b
+"""
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+def test_patched_run_uses_warm_worktree_after_generated_tests(tmp_path):
+    repo = str(tmp_path / "repo")
+    os.makedirs(repo)
+    with open(os.path.join(repo, "calc.py"), "w") as f:
+        f.write("def add(a, b):\n    return a - b\n")
+    _git(repo, "init", "-q")
+    _git(repo, "add", "calc.py")
+    _git(repo, "commit", "-q", "-m", "initial")
+    
+    client = PytestClient()
+    client.mock_mode = False
+    
+    async def pipeline_sequence():
+        # The pipeline tests the workspace first, which writes tests/ into it
+        await client.run_tests(repo, generate_tests_if_missing=True)
+        return await client._run_tests_with_patch(repo, PATCH)
+    
+    try:
+        result = asyncio.run(pipeline_sequence())
+        
+        assert os.path.isdir(os.path.join(repo, "tests"))
+        worktree = pytest_client._WARM_WORKTREES.get(os.path.realpath(repo))
+        assert worktree is not None
+        # The generated tests were carried into the worktree and the patch applied there
+        assert sorted(os.listdir(os.path.join(worktree, "tests"))) == sorted(os.listdir(os.path.join(repo, "tests")))
+        with open(os.path.join(worktree, "calc.py")) as f:
+            assert "a + b" in f.read()
+        assert "passed" in result
+    finally:
+        pytest_client._drop_warm_worktrees()
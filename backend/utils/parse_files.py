@@ -1,21 +1,135 @@
 import os
 import ast
-from typing import Dict, Any, List, Optional
-from pathlib import Path
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterator, Optional
+
+# Below this many files the process pool start-up costs more than it saves
+_PARALLEL_MIN_FILES = 32
+# Upper bound on per-file results a FileParser keeps between runs
+_CACHE_SIZE = 10000
+# Directories that never hold the repository's own sources
+_SKIP_DIRS = frozenset({
+    '.git', '__pycache__', '.venv', 'venv', 'node_modules',
+    '.tox', 'dist', 'build', '.pytest_cache', '.mypy_cache', 'site-packages'
+})
+
+# Worker pool shared by every FileParser, started on first use
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Return the shared parsing pool, creating it on first use"""
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        # Leave one core free for the rest of the service; spawned workers start
+        # clean instead of forking a process that runs threads
+        _PARSE_POOL = ProcessPoolExecutor(
+            max_workers=max(1, (os.cpu_count() or 1) - 1),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _PARSE_POOL
+
+
+class _Collector(ast.NodeVisitor):
+    """Collect everything analyze_python_file reports in a single pass over the tree"""
+    
+    def __init__(self):
+        self.issues = []
+        self.warnings = []
+        self.imports = []
+        # Names bound by each entry of imports, and every name the module references
+        self.bound_names = []
+        self.used_names = set()
+        self.functions = []
+        self.classes = []
+    
+    def visit_ExceptHandler(self, node):
+        # Check for bare except clauses
+        if node.type is None:
+            self.issues.append(f"Bare except clause at line {node.lineno}")
+        self.generic_visit(node)
+    
+    def visit_Call(self, node):
+        # Check for eval/exec usage
+        if isinstance(node.func, ast.Name) and node.func.id in ['eval', 'exec']:
+            self.issues.append(f"Use of {node.func.id}() at line {node.lineno} - security risk")
+        self.generic_visit(node)
+    
+    def visit_Name(self, node):
+        self.used_names.add(node.id)
+    
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.imports.append(alias.name)
+            self.bound_names.append([alias.asname or alias.name.split('.')[0]])
+    
+    def visit_ImportFrom(self, node):
+        if node.module:
+            self.imports.append(node.module)
+            self.bound_names.append([alias.asname or alias.name for alias in node.names])
+    
+    def visit_FunctionDef(self, node):
+        self.functions.append({
+            "name": node.name,
+            "line": node.lineno,
+            "args": [arg.arg for arg in node.args.args],
+            "has_docstring": ast.get_docstring(node) is not None
+        })
+        self.generic_visit(node)
+    
+    def visit_ClassDef(self, node):
+        self.classes.append({
+            "name": node.name,
+            "line": node.lineno,
+            "has_docstring": ast.get_docstring(node) is not None,
+            "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
+        })
+        self.generic_visit(node)
+
 
 class FileParser:
     def __init__(self):
-        pass
+        # Per-file results keyed by (path, mtime, size), so unchanged files are not reparsed
+        self._cache: Dict[tuple, Dict[str, Any]] = {}
+    
+    @staticmethod
+    def _cache_key(file_path: str) -> Optional[tuple]:
+        """Identify a file's current contents by path, mtime and size"""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return (file_path, st.st_mtime_ns, st.st_size)
+    
+    def _remember(self, key: Optional[tuple], result: Dict[str, Any]) -> None:
+        """Store a result, evicting the oldest entry once the cache is full"""
+        if key is None:
+            return
+        self._cache[key] = result
+        if len(self._cache) > _CACHE_SIZE:
+            del self._cache[next(iter(self._cache))]
     
     def analyze_python_file(self, file_path: str) -> Dict[str, Any]:
         """Analyze a Python file for common issues"""
+        key = self._cache_key(str(file_path))
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._parse_file(file_path)
+        self._remember(key, result)
+        return result
+    
+    def _parse_file(self, file_path: str) -> Dict[str, Any]:
+        """Parse and check a single file, bypassing the cache"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # Raw bytes; the parser handles BOMs and coding declarations itself
+            with open(file_path, 'rb') as f:
                 content = f.read()
             
-            # Parse AST
+            # Parse AST, independent of this module's __future__ flags
             try:
-                tree = ast.parse(content)
+                tree = compile(content, file_path, 'exec', flags=ast.PyCF_ONLY_AST, dont_inherit=True)
             except SyntaxError as e:
                 return {
                     "syntax_error": True,
@@ -24,47 +138,24 @@ class FileParser:
                     "issues": ["Syntax error detected"]
                 }
             
-            issues = []
-            warnings = []
-            
             # Analyze AST nodes
-            for node in ast.walk(tree):
-                # Check for bare except clauses
-                if isinstance(node, ast.ExceptHandler) and node.type is None:
-                    issues.append(f"Bare except clause at line {node.lineno}")
-                
-                # Check for eval/exec usage
-                if isinstance(node, ast.Call):
-                    if isinstance(node.func, ast.Name):
-                        if node.func.id in ['eval', 'exec']:
-                            issues.append(f"Use of {node.func.id}() at line {node.lineno} - security risk")
-                
-                # Check for print statements (Python 2 style)
-                if isinstance(node, ast.Print):
-                    warnings.append(f"Python 2 style print statement at line {node.lineno}")
-            
-            # Check for unused imports
-            imports = []
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(node.module)
+            collector = _Collector()
+            collector.visit(tree)
+            warnings = collector.warnings
             
-            # Simple check for unused imports (basic implementation)
-            for imp in imports:
-                if imp not in content.replace(f"import {imp}", "").replace(f"from {imp}", ""):
+            # Check for unused imports against the names the module references
+            for imp, names in zip(collector.imports, collector.bound_names):
+                # A star import binds names we can't see, so it is never flagged
+                if '*' not in names and not collector.used_names.intersection(names):
                     warnings.append(f"Potentially unused import: {imp}")
             
             return {
                 "syntax_error": False,
-                "issues": issues,
+                "issues": collector.issues,
                 "warnings": warnings,
-                "imports": imports,
-                "functions": self._extract_functions(tree),
-                "classes": self._extract_classes(tree)
+                "imports": collector.imports,
+                "functions": collector.functions,
+                "classes": collector.classes
             }
             
         except Exception as e:
@@ -73,82 +164,96 @@ class FileParser:
                 "issues": [f"Error analyzing file: {str(e)}"]
             }
     
-    def _extract_functions(self, tree: ast.AST) -> List[Dict[str, Any]]:
-        """Extract function information from AST"""
-        functions = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                functions.append({
-                    "name": node.name,
-                    "line": node.lineno,
-                    "args": [arg.arg for arg in node.args.args],
-                    "has_docstring": ast.get_docstring(node) is not None
-                })
-        
-        return functions
+    @staticmethod
+    def _analyze_path_static(file_path: str) -> Dict[str, Any]:
+        """Process pool entry point for _parse_file"""
+        return FileParser()._parse_file(file_path)
     
-    def _extract_classes(self, tree: ast.AST) -> List[Dict[str, Any]]:
-        """Extract class information from AST"""
-        classes = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                classes.append({
-                    "name": node.name,
-                    "line": node.lineno,
-                    "has_docstring": ast.get_docstring(node) is not None,
-                    "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
-                })
-        
-        return classes
+    @staticmethod
+    def _iter_python_files(repo_path: str) -> Iterator[str]:
+        """Yield .py file paths under repo_path without descending into _SKIP_DIRS"""
+        # scandir's cached d_type answers is_dir/is_file without a stat per entry
+        stack = [repo_path]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith('.py') and entry.is_file():
+                        yield entry.path
     
     def analyze_repository(self, repo_path: str) -> Dict[str, Any]:
         """Analyze entire repository for issues"""
-        python_files = list(Path(repo_path).rglob("*.py"))
+        # Plain path strings, collected while skipping vendored and build trees
+        paths = list(self._iter_python_files(repo_path))
         
-        analysis_results = {
-            "total_files": len(python_files),
-            "files_with_issues": 0,
-            "total_issues": 0,
-            "total_warnings": 0,
-            "file_analyses": {},
-            "summary": {
-                "critical_issues": [],
-                "warnings": [],
-                "suggestions": []
-            }
-        }
+        # Only files that changed since the last run need parsing again
+        keys = [self._cache_key(path) for path in paths]
+        misses = [path for path, key in zip(paths, keys) if key not in self._cache]
+        
+        # Parsing is CPU-bound, so large repos are spread across processes
+        if len(misses) >= _PARALLEL_MIN_FILES:
+            pool = _get_parse_pool()
+            fresh = dict(zip(misses, pool.map(FileParser._analyze_path_static, misses, chunksize=16)))
+        else:
+            fresh = {path: self._parse_file(path) for path in misses}
         
+        # Totals are kept in locals and written into the result once at the end
+        files_with_issues = 0
+        total_issues = 0
+        total_warnings = 0
+        file_analyses = {}
         critical_issues = []
         warnings = []
         
-        for py_file in python_files:
+        for path, key in zip(paths, keys):
+            if path in fresh:
+                file_analysis = fresh[path]
+                self._remember(key, file_analysis)
+            else:
+                file_analysis = self._cache[key]
+            
+            file_name = os.path.basename(path)
             try:
-                file_analysis = self.analyze_python_file(str(py_file))
-                analysis_results["file_analyses"][str(py_file.relative_to(repo_path))] = file_analysis
+                file_analyses[os.path.relpath(path, repo_path)] = file_analysis
                 
                 if file_analysis.get("syntax_error"):
-                    critical_issues.append(f"Syntax error in {py_file.name}")
-                    analysis_results["files_with_issues"] += 1
+                    critical_issues.append(f"Syntax error in {file_name}")
+                    files_with_issues += 1
                 
                 issues = file_analysis.get("issues", [])
                 warnings_list = file_analysis.get("warnings", [])
                 
-                analysis_results["total_issues"] += len(issues)
-                analysis_results["total_warnings"] += len(warnings_list)
+                total_issues += len(issues)
+                total_warnings += len(warnings_list)
                 
                 if issues:
-                    analysis_results["files_with_issues"] += 1
-                    critical_issues.extend([f"{py_file.name}: {issue}" for issue in issues])
+                    files_with_issues += 1
+                    critical_issues.extend(f"{file_name}: {issue}" for issue in issues)
                 
-                warnings.extend([f"{py_file.name}: {warning}" for warning in warnings_list])
+                warnings.extend(f"{file_name}: {warning}" for warning in warnings_list)
                 
             except Exception as e:
-                critical_issues.append(f"Error analyzing {py_file.name}: {str(e)}")
+                critical_issues.append(f"Error analyzing {file_name}: {str(e)}")
         
-        analysis_results["summary"]["critical_issues"] = critical_issues
-        analysis_results["summary"]["warnings"] = warnings
+        analysis_results = {
+            "total_files": len(paths),
+            "files_with_issues": files_with_issues,
+            "total_issues": total_issues,
+            "total_warnings": total_warnings,
+            "file_analyses": file_analyses,
+            "summary": {
+                "critical_issues": critical_issues,
+                "warnings": warnings,
+                "suggestions": []
+            }
+        }
         
         # Generate suggestions
         suggestions = []
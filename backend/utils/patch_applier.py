@@ -1,41 +1,35 @@
-import os
+import re
 import subprocess
 import tempfile
 from typing import Optional, Dict, Any
 import shutil
 
+# One pass over the whole diff: file headers, added lines and removed lines
+_PATCH_LINE_RE = re.compile(
+    r'^(?:(?:--- a|\+\+\+ b)/(?P<file>.*)|(?P<add>\+)(?!\+\+)|(?P<delete>-)(?!--))',
+    re.MULTILINE
+)
+
+# Past this size git's own diff parser beats the regex pass despite the fork
+_NUMSTAT_MIN_BYTES = 1 << 20
+
 class PatchApplier:
+    # Whether git is on PATH, probed by the first instance
+    _has_git: Optional[bool] = None
+    
     def __init__(self):
-        pass
+        if PatchApplier._has_git is None:
+            PatchApplier._has_git = shutil.which("git") is not None
     
     def apply_patch(self, workspace_path: str, patch_content: str) -> Dict[str, Any]:
         """Apply a unified diff patch to the workspace"""
         try:
-            # Create temporary patch file
-            patch_file = os.path.join(workspace_path, "bugsniper_patch.diff")
-            
-            with open(patch_file, "w") as f:
-                f.write(patch_content)
-            
-            # Apply patch using git
-            result = subprocess.run(
-                ["git", "apply", "--check", patch_file],
-                cwd=workspace_path,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                return {
-                    "success": False,
-                    "error": f"Patch validation failed: {result.stderr}",
-                    "details": result.stderr
-                }
-            
-            # Actually apply the patch
+            # Apply patch using git, fed on stdin; a patch that does not
+            # apply cleanly is rejected as a whole and leaves the tree untouched
             result = subprocess.run(
-                ["git", "apply", patch_file],
+                ["git", "apply", "-"],
                 cwd=workspace_path,
+                input=patch_content,
                 capture_output=True,
                 text=True
             )
@@ -47,9 +41,6 @@ class PatchApplier:
                     "details": result.stderr
                 }
             
-            # Clean up patch file
-            os.remove(patch_file)
-            
             return {
                 "success": True,
                 "message": "Patch applied successfully"
@@ -65,20 +56,15 @@ class PatchApplier:
     def validate_patch(self, patch_content: str) -> Dict[str, Any]:
         """Validate a patch without applying it"""
         try:
-            # Create temporary directory for validation
+            # Empty directory for validation, so the check never reads the caller's tree
             temp_dir = tempfile.mkdtemp(prefix="patch_validation_")
             
             try:
-                # Create a dummy file structure for validation
-                patch_file = os.path.join(temp_dir, "patch.diff")
-                
-                with open(patch_file, "w") as f:
-                    f.write(patch_content)
-                
                 # Try to parse the patch
                 result = subprocess.run(
-                    ["git", "apply", "--check", patch_file],
+                    ["git", "apply", "--check", "-"],
                     cwd=temp_dir,
+                    input=patch_content,
                     capture_output=True,
                     text=True
                 )
@@ -106,26 +92,72 @@ class PatchApplier:
                 "message": "Exception during patch validation"
             }
     
+    def _numstat_patch_info(self, patch_content: str) -> Optional[Dict[str, Any]]:
+        """Count a patch's changes with git apply --numstat, or None if git can't read it"""
+        try:
+            # Inside a checkout git reads patch paths relative to the current
+            # subdirectory and drops the rest, so it runs from an empty directory
+            with tempfile.TemporaryDirectory(prefix="patch_numstat_") as temp_dir:
+                result = subprocess.run(
+                    ["git", "apply", "--numstat", "-"],
+                    cwd=temp_dir,
+                    input=patch_content,
+                    capture_output=True,
+                    text=True
+                )
+        except OSError:
+            return None
+        
+        if result.returncode != 0:
+            return None
+        
+        files_modified: Dict[str, None] = {}
+        additions = 0
+        deletions = 0
+        for row in result.stdout.splitlines():
+            added, deleted, file_path = row.split('\t', 2)
+            files_modified[file_path] = None
+            # Binary files report "-" for both counts
+            if added != '-':
+                additions += int(added)
+                deletions += int(deleted)
+        
+        # Nothing recognised (git skipped every path, or the headers aren't
+        # git's own); let the regex pass count it instead
+        if not files_modified:
+            return None
+        
+        return {
+            "files_modified": list(files_modified),
+            "additions": additions,
+            "deletions": deletions,
+            "total_changes": additions + deletions
+        }
+    
     def extract_patch_info(self, patch_content: str) -> Dict[str, Any]:
         """Extract information from a patch"""
+        if self._has_git and len(patch_content) >= _NUMSTAT_MIN_BYTES:
+            info = self._numstat_patch_info(patch_content)
+            if info is not None:
+                return info
+        
         try:
-            lines = patch_content.split('\n')
-            files_modified = []
+            # Insertion-ordered set of paths
+            files_modified: Dict[str, None] = {}
             additions = 0
             deletions = 0
             
-            for line in lines:
-                if line.startswith('--- a/') or line.startswith('+++ b/'):
-                    file_path = line.split('/', 1)[1] if '/' in line else line[6:]
-                    if file_path not in files_modified:
-                        files_modified.append(file_path)
-                elif line.startswith('+') and not line.startswith('+++'):
+            for match in _PATCH_LINE_RE.finditer(patch_content):
+                kind = match.lastgroup
+                if kind == 'file':
+                    files_modified[match.group('file')] = None
+                elif kind == 'add':
                     additions += 1
-                elif line.startswith('-') and not line.startswith('---'):
+                else:
                     deletions += 1
             
             return {
-                "files_modified": files_modified,
+                "files_modified": list(files_modified),
                 "additions": additions,
                 "deletions": deletions,
                 "total_changes": additions + deletions
@@ -1,40 +1,57 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator
+from collections import Counter, OrderedDict
+from types import MappingProxyType
+import hashlib
 import json
+import operator
 
-class PromptBuilder:
-    def __init__(self):
-        pass
+# Shared read-only stand-in for missing nested sections of the context
+_EMPTY_DICT = MappingProxyType({})
+
+# Indented JSON keyed by the compact encoding of the same value. The compact
+# form comes from the C encoder, while indent=2 falls back to the pure-Python
+# one, so repeat commits with unchanged structures skip the slow path
+_INDENTED_JSON_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_INDENTED_JSON_CACHE_SIZE = 256
+
+
+def _indented_json(value: Any) -> str:
+    """json.dumps(value, indent=2), reusing the result for values seen recently"""
+    key = json.dumps(value)
+    cached = _INDENTED_JSON_CACHE.get(key)
+    if cached is not None:
+        _INDENTED_JSON_CACHE.move_to_end(key)
+        return cached
     
-    def build_analysis_prompt(self, context: Dict[str, Any]) -> str:
-        """Build a comprehensive prompt for Gemini analysis"""
-        prompt = f"""
+    cached = json.dumps(value, indent=2)
+    _INDENTED_JSON_CACHE[key] = cached
+    if len(_INDENTED_JSON_CACHE) > _INDENTED_JSON_CACHE_SIZE:
+        _INDENTED_JSON_CACHE.popitem(last=False)
+    return cached
+
+
+# The invariant parts of each prompt, built once at import; only the
+# per-commit fields are filled in on each call
+_ANALYSIS_HEADER_TMPL = """
 You are BugSniper Pro, an advanced AI debugging agent powered by Gemini 1.5 Pro, specializing in comprehensive code analysis. Analyze the following code and test results to identify bugs, security issues, and optimization opportunities with maximum specificity and detail. Use your advanced reasoning capabilities to provide deep, accurate analysis.
 
 COMMIT CONTEXT:
-- SHA: {context.get('commit_sha', 'unknown')}
-- Message: {context.get('commit_message', 'No message')}
-- Author: {context.get('commit_author', 'unknown')}
-- Repository Structure: {json.dumps(context.get('repo_structure', []), indent=2)}
+- SHA: {commit_sha}
+- Message: {commit_message}
+- Author: {commit_author}
+- Repository Structure: {repo_structure}
 
 TESTSPRITE ANALYSIS:
-- Tests Passed: {context.get('testsprite_result', {}).get('passed', False)}
-- Total Tests: {context.get('testsprite_result', {}).get('total_tests', 0)}
-- Failed Tests: {context.get('testsprite_result', {}).get('failed_tests', 0)}
-- Execution Time: {context.get('testsprite_result', {}).get('execution_time', 'unknown')}
-- Detailed Diagnostics: {json.dumps(context.get('testsprite_result', {}).get('diagnostics', []), indent=2)}
+- Tests Passed: {passed}
+- Total Tests: {total_tests}
+- Failed Tests: {failed_tests}
+- Execution Time: {execution_time}
+- Detailed Diagnostics: {diagnostics}
 
 CODE FILES TO ANALYZE:
 """
-        
-        # Add file contents with line numbers for better reference
-        file_contents = context.get('file_contents', {})
-        for file_path, content in file_contents.items():
-            # Add line numbers to help with specific references
-            lines = content.split('\n')
-            numbered_content = '\n'.join(f"{i+1:4d}| {line}" for i, line in enumerate(lines))
-            prompt += f"\n--- {file_path} ---\n{numbered_content}\n"
-        
-        prompt += """
+
+_ANALYSIS_FOOTER = """
 
 DETAILED ANALYSIS REQUIREMENTS:
 1. **Bug Detection**: Identify specific bugs with exact line numbers, file names, and detailed explanations
@@ -151,35 +168,22 @@ Generate a comprehensive analysis with concise, readable descriptions and action
 Ensure the patch addresses the most critical issues with precise line-level changes.
 Make deployment decisions based on the severity and impact of all identified issues.
 """
-        
-        return prompt
-    
-    def build_summary_prompt(self, analysis_results: Dict[str, Any]) -> str:
-        """Build a prompt for generating user-friendly summaries"""
-        bugs_detected = analysis_results.get('bugs_detected', [])
-        optimizations = analysis_results.get('optimizations', [])
-        analysis_details = analysis_results.get('analysis_details', {})
-        
-        # Count issues by type and severity
-        critical_issues = sum(1 for bug in bugs_detected if isinstance(bug, dict) and bug.get('severity') == 'critical')
-        high_issues = sum(1 for bug in bugs_detected if isinstance(bug, dict) and bug.get('severity') == 'high')
-        security_issues = sum(1 for bug in bugs_detected if isinstance(bug, dict) and bug.get('type') == 'security_vulnerability')
-        
-        prompt = f"""
+
+_SUMMARY_TMPL = """
 Generate a comprehensive, user-friendly summary of the BugSniper Pro analysis:
 
 ANALYSIS RESULTS:
-- Total Issues Found: {len(bugs_detected)}
+- Total Issues Found: {total_issues}
 - Critical Issues: {critical_issues}
 - High Priority Issues: {high_issues}
 - Security Issues: {security_issues}
-- Optimizations Suggested: {len(optimizations)}
-- Deployable Status: {analysis_results.get('deployable_status', 'unknown')}
-- Confidence Score: {analysis_results.get('confidence_score', 0.0):.2f}
-- Files Analyzed: {len(analysis_details.get('files_analyzed', []))}
+- Optimizations Suggested: {optimizations}
+- Deployable Status: {deployable_status}
+- Confidence Score: {confidence_score:.2f}
+- Files Analyzed: {files_analyzed}
 
 DETAILED BREAKDOWN:
-{json.dumps(analysis_results, indent=2)}
+{details}
 
 Create a clear, detailed summary that explains:
 1. **Issue Overview**: Specific types and counts of issues found
@@ -199,5 +203,124 @@ Format the summary with:
 
 Keep it comprehensive but accessible, under 400 words, using clear technical language.
 """
+
+# Rendered analysis prompts keyed by a digest of their header and files, so
+# retries and re-runs of the same commit skip renumbering every file. Prompts
+# embed whole files, so the cache is bounded by total characters, not entries
+_PROMPT_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+_PROMPT_CACHE_MAX_CHARS = 16 << 20
+_prompt_cache_chars = 0
+
+
+def _remember_prompt(key: bytes, prompt: str) -> None:
+    """Cache a rendered prompt, dropping the oldest ones to stay within _PROMPT_CACHE_MAX_CHARS"""
+    global _prompt_cache_chars
+    # A prompt that alone exceeds the budget would only evict everything else
+    if len(prompt) > _PROMPT_CACHE_MAX_CHARS:
+        return
+    _PROMPT_CACHE[key] = prompt
+    _prompt_cache_chars += len(prompt)
+    while _prompt_cache_chars > _PROMPT_CACHE_MAX_CHARS:
+        _, evicted = _PROMPT_CACHE.popitem(last=False)
+        _prompt_cache_chars -= len(evicted)
+
+
+# "   1| " ... "10000| ", so numbering a file is one concatenation per line
+_LINE_PREFIXES = [f"{i:4d}| " for i in range(1, 10001)]
+
+
+def _number_lines(content: str) -> str:
+    """Prefix each line of content with its right-aligned line number"""
+    lines = content.split('\n')
+    prefixes = _LINE_PREFIXES
+    if len(lines) > len(prefixes):
+        prefixes = prefixes + [f"{i:4d}| " for i in range(len(prefixes) + 1, len(lines) + 1)]
+    return '\n'.join(map(operator.add, prefixes, lines))
+
+
+class PromptBuilder:
+    def __init__(self):
+        pass
+    
+    def _analysis_header(self, context: Dict[str, Any]) -> str:
+        """Render the commit and test context that opens the analysis prompt"""
+        testsprite = context.get('testsprite_result') or _EMPTY_DICT
+        return _ANALYSIS_HEADER_TMPL.format(
+            commit_sha=context.get('commit_sha', 'unknown'),
+            commit_message=context.get('commit_message', 'No message'),
+            commit_author=context.get('commit_author', 'unknown'),
+            repo_structure=_indented_json(context.get('repo_structure', [])),
+            passed=testsprite.get('passed', False),
+            total_tests=testsprite.get('total_tests', 0),
+            failed_tests=testsprite.get('failed_tests', 0),
+            execution_time=testsprite.get('execution_time', 'unknown'),
+            diagnostics=_indented_json(testsprite.get('diagnostics', []))
+        )
+    
+    def _iter_file_sections(self, file_contents: Dict[str, str]) -> Iterator[str]:
+        """Yield each file's heading and line-numbered body"""
+        for file_path, content in file_contents.items():
+            # Add line numbers to help with specific references
+            yield f"\n--- {file_path} ---\n"
+            yield _number_lines(content)
+            yield "\n"
+    
+    def build_analysis_prompt(self, context: Dict[str, Any]) -> str:
+        """Build a comprehensive prompt for Gemini analysis"""
+        header = self._analysis_header(context)
+        
+        # The header carries every other input, so it plus the files identify the prompt
+        file_contents = context.get('file_contents', {})
+        digest = hashlib.blake2b(header.encode(), digest_size=16)
+        for file_path, content in file_contents.items():
+            # Length-prefixed so no two different inputs hash the same byte stream
+            path_bytes, content_bytes = file_path.encode(), content.encode()
+            digest.update(b'%d:%d:' % (len(path_bytes), len(content_bytes)))
+            digest.update(path_bytes)
+            digest.update(content_bytes)
+        key = digest.digest()
+        
+        cached = _PROMPT_CACHE.get(key)
+        if cached is not None:
+            _PROMPT_CACHE.move_to_end(key)
+            return cached
+        
+        # Sections are collected and joined once instead of regrowing the prompt per file
+        parts = [header]
+        parts.extend(self._iter_file_sections(file_contents))
+        parts.append(_ANALYSIS_FOOTER)
+        
+        prompt = ''.join(parts)
+        _remember_prompt(key, prompt)
+        return prompt
+    
+    def build_summary_prompt(self, analysis_results: Dict[str, Any]) -> str:
+        """Build a prompt for generating user-friendly summaries"""
+        bugs_detected = analysis_results.get('bugs_detected', [])
+        optimizations = analysis_results.get('optimizations', [])
+        analysis_details = analysis_results.get('analysis_details') or _EMPTY_DICT
+        
+        # Count issues by type and severity in a single pass
+        severities = Counter()
+        types = Counter()
+        for bug in bugs_detected:
+            if isinstance(bug, dict):
+                severities[bug.get('severity')] += 1
+                types[bug.get('type')] += 1
+        critical_issues = severities['critical']
+        high_issues = severities['high']
+        security_issues = types['security_vulnerability']
+        
+        prompt = _SUMMARY_TMPL.format(
+            total_issues=len(bugs_detected),
+            critical_issues=critical_issues,
+            high_issues=high_issues,
+            security_issues=security_issues,
+            optimizations=len(optimizations),
+            deployable_status=analysis_results.get('deployable_status', 'unknown'),
+            confidence_score=analysis_results.get('confidence_score', 0.0),
+            files_analyzed=len(analysis_details.get('files_analyzed', [])),
+            details=json.dumps(analysis_results, indent=2)
+        )
         
         return prompt
\ No newline at end of file
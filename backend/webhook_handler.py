@@ -1,33 +1,136 @@
 import os
+import asyncio
 import hmac
-import hashlib
 import json
-from typing import Dict, Any, Optional
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Set
 from fastapi import Request, HTTPException
 import httpx
 from github_ops import GitHubOperations
 from models.schemas import WebhookPayload, JobCreate
-from models.database import get_db, Repository, User
+from models.database import SessionLocal, Repository, User
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
+# orjson parses the raw payload bytes several times faster when it is installed;
+# its JSONDecodeError subclasses json's, so error handling is the same either way
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# How long GitHub repository ids found active are trusted without asking the database
+_MONITORED_TTL = 60.0
+# How long a full_name found unmonitored is answered without the database. The
+# main.py invalidation only reaches this process, so with several workers a
+# repository activated elsewhere can be ignored here for up to this long
+_UNMONITORED_TTL = 30.0
+# Unmonitored full_names remembered at most, oldest dropped first
+_UNMONITORED_SIZE = 1000
+# Delivery GUIDs remembered so GitHub's redeliveries are dropped unhashed
+_SEEN_DELIVERIES_SIZE = 1000
+
 class WebhookHandler:
     def __init__(self):
-        self.webhook_secret = os.getenv("GITHUB_WEBHOOK_SECRET")
-        if not self.webhook_secret:
+        webhook_secret = os.getenv("GITHUB_WEBHOOK_SECRET")
+        if not webhook_secret:
             raise ValueError("GITHUB_WEBHOOK_SECRET environment variable is required")
+        # HMAC key, encoded once rather than per webhook; only the bytes are kept
+        self._secret_bytes = webhook_secret.encode('utf-8')
+        self._monitored_ids: Set[int] = set()
+        self._monitored_at = 0.0
+        self._seen_deliveries: "OrderedDict[str, None]" = OrderedDict()
+        # full_name -> when the database last said it isn't monitored, oldest first
+        self._unmonitored: "OrderedDict[str, float]" = OrderedDict()
+    
+    def invalidate_monitored_repositories(self) -> None:
+        """Re-read the monitored repositories on the next webhook"""
+        self._monitored_at = 0.0
+        self._unmonitored.clear()
+    
+    @staticmethod
+    def _lookup_target(github_id: int) -> Optional[Any]:
+        """First active repository row that is, or could be, the one with this GitHub id"""
+        db = SessionLocal()
+        try:
+            # Rows without a github_id can't be ruled out by id, so they count as a match
+            return db.query(Repository.github_id).filter(
+                Repository.is_active == True,
+                or_(Repository.github_id == github_id, Repository.github_id.is_(None))
+            ).first()
+        finally:
+            db.close()
+    
+    async def _is_monitored_target(self, github_id: int) -> bool:
+        """Whether a push to this GitHub repository id may be for a monitored repository"""
+        now = time.monotonic()
+        if now - self._monitored_at > _MONITORED_TTL:
+            self._monitored_ids.clear()
+            self._monitored_at = now
+        
+        # Ids seen active are trusted for a while; a stale entry only lets the
+        # push through to the full check, never rejects it
+        if github_id in self._monitored_ids:
+            return True
+        
+        # Anything else asks the database, which every worker shares, so a
+        # repository activated in another worker is never turned away
+        row = await asyncio.to_thread(self._lookup_target, github_id)
+        if row is None:
+            return False
+        if row.github_id == github_id:
+            self._monitored_ids.add(github_id)
+        return True
+    
+    async def _should_skip(self, request: Request) -> Optional[Dict[str, Any]]:
+        """Answer redeliveries and pushes to unmonitored repositories from headers alone"""
+        delivery = request.headers.get("X-GitHub-Delivery")
+        if delivery and delivery in self._seen_deliveries:
+            return {"message": "Delivery already processed", "status": "ignored"}
+        
+        # Repository webhooks name their repository in the hook target headers
+        if request.headers.get("X-GitHub-Hook-Installation-Target-Type") == "repository":
+            target_id = request.headers.get("X-GitHub-Hook-Installation-Target-ID", "")
+            if target_id.isdigit() and not await self._is_monitored_target(int(target_id)):
+                return {"message": "Repository not monitored", "status": "ignored"}
+        
+        return None
+    
+    def _remember_delivery(self, request: Request) -> None:
+        """Record a verified delivery so a redelivery of it is skipped"""
+        delivery = request.headers.get("X-GitHub-Delivery")
+        if delivery:
+            self._seen_deliveries[delivery] = None
+            if len(self._seen_deliveries) > _SEEN_DELIVERIES_SIZE:
+                self._seen_deliveries.popitem(last=False)
+    
+    def _remember_unmonitored(self, full_name: str) -> None:
+        """Record that the database found full_name missing or inactive"""
+        self._unmonitored[full_name] = time.monotonic()
+        # Re-recorded names move to the end, so the front always holds the oldest
+        self._unmonitored.move_to_end(full_name)
+        if len(self._unmonitored) > _UNMONITORED_SIZE:
+            self._unmonitored.popitem(last=False)
     
     def verify_signature(self, payload: bytes, signature: str) -> bool:
         """Verify GitHub webhook signature using HMAC"""
-        if not signature.startswith("sha256="):
+        # One-shot digest runs entirely inside OpenSSL, without an HMAC object
+        return self._digest_matches(hmac.digest(self._secret_bytes, payload, 'sha256'), signature)
+    
+    @staticmethod
+    def _digest_matches(expected: bytes, signature: str) -> bool:
+        """Constant-time check of a raw SHA-256 HMAC against an X-Hub-Signature-256 value"""
+        # "sha256=" followed by 64 hex digits
+        if len(signature) != 71 or not signature.startswith("sha256="):
             return False
         
-        expected_signature = "sha256=" + hmac.new(
-            self.webhook_secret.encode(),
-            payload,
-            hashlib.sha256
-        ).hexdigest()
+        try:
+            provided = bytes.fromhex(signature[7:])
+        except ValueError:
+            return False
         
-        return hmac.compare_digest(signature, expected_signature)
+        return hmac.compare_digest(expected, provided)
     
     async def handle_push_webhook(self, request: Request) -> Dict[str, Any]:
         """Handle GitHub push webhook"""
@@ -36,16 +139,26 @@ class WebhookHandler:
         if not signature:
             raise HTTPException(status_code=400, detail="Missing signature")
         
-        # Read payload
-        payload = await request.body()
+        # Skip the body entirely when the headers already rule the push out
+        skipped = await self._should_skip(request)
+        if skipped:
+            return skipped
+        
+        # Read payload, hashing each chunk as it arrives instead of in a
+        # second pass over the whole body
+        mac = hmac.new(self._secret_bytes, digestmod='sha256')
+        payload = bytearray()
+        async for chunk in request.stream():
+            mac.update(chunk)
+            payload += chunk
         
         # Verify signature
-        if not self.verify_signature(payload, signature):
+        if not self._digest_matches(mac.digest(), signature):
             raise HTTPException(status_code=401, detail="Invalid signature")
         
         # Parse payload
         try:
-            webhook_data = json.loads(payload.decode())
+            webhook_data = _json_loads(payload)
         except json.JSONDecodeError:
             raise HTTPException(status_code=400, detail="Invalid JSON payload")
         
@@ -68,13 +181,22 @@ class WebhookHandler:
         commit_sha = latest_commit["id"]
         
         # Check if this repository is monitored
-        db = next(get_db())
+        # Repositories recently found unmonitored are answered without a session
+        checked_at = self._unmonitored.get(full_name)
+        if checked_at is not None:
+            if time.monotonic() - checked_at < _UNMONITORED_TTL:
+                return {"message": "Repository not monitored", "status": "ignored"}
+            del self._unmonitored[full_name]
+        
+        db = SessionLocal()
         try:
-            repository = db.query(Repository).filter(
-                Repository.full_name == full_name
-            ).first()
+            # The sync driver runs in a worker thread so the event loop keeps serving
+            repository = await asyncio.to_thread(
+                db.query(Repository).filter(Repository.full_name == full_name).first
+            )
             
             if not repository or not repository.is_active:
+                self._remember_unmonitored(full_name)
                 return {"message": "Repository not monitored", "status": "ignored"}
             
             # Create a new job
@@ -83,14 +205,16 @@ class WebhookHandler:
                 commit_sha=commit_sha
             )
             
-            # Trigger the analysis pipeline
-            from pipeline import AnalysisPipeline
-            pipeline = AnalysisPipeline()
+            # Trigger the analysis pipeline, built once at application startup
+            pipeline = request.app.state.pipeline
             
             # Start the analysis in the background
-            import asyncio
             asyncio.create_task(pipeline.run_analysis(job_data, repository, db))
             
+            # Remembered only once verified and started, so neither a forged
+            # delivery nor a failed attempt can shadow a real redelivery
+            self._remember_delivery(request)
+            
             return {
                 "message": "Analysis started",
                 "status": "success",
@@ -6,17 +6,30 @@ Test script to verify BugSniper Pro setup
 import os
 import sys
 import subprocess
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def check_file_exists(file_path, description):
+def check_file_exists(file_path, description, exists=None):
     """Check if a file exists and print status"""
-    if os.path.exists(file_path):
+    if exists is None:
+        exists = os.path.exists(file_path)
+    if exists:
         print(f"✅ {description}: {file_path}")
         return True
     else:
         print(f"❌ {description}: {file_path} (MISSING)")
         return False
 
+def is_package_installed(package):
+    """Locate a package without importing it"""
+    name = package.replace('-', '_')
+    root = name.split('.')[0]
+    # find_spec on a dotted name imports its parent, so only look once the root is there
+    if importlib.util.find_spec(root) is None:
+        return False
+    return root == name or importlib.util.find_spec(name) is not None
+
 def check_python_packages():
     """Check if required Python packages are installed"""
     required_packages = [
@@ -27,11 +40,15 @@ def check_python_packages():
     print("\n📦 Checking Python packages...")
     missing_packages = []
     
-    for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
+    # find_spec walks the import finders without running the package's code;
+    # the lookups are independent, so they run side by side and report in order
+    with ThreadPoolExecutor() as executor:
+        installed = list(executor.map(is_package_installed, required_packages))
+    
+    for package, is_installed in zip(required_packages, installed):
+        if is_installed:
             print(f"✅ {package}")
-        except ImportError:
+        else:
             print(f"❌ {package} (NOT INSTALLED)")
             missing_packages.append(package)
     
@@ -100,9 +117,13 @@ def main():
         ("env.example", "Environment template")
     ]
     
+    # Stat every file concurrently, then print the results in list order
+    with ThreadPoolExecutor() as executor:
+        found = list(executor.map(os.path.exists, [file_path for file_path, _ in files_to_check]))
+    
     all_files_exist = True
-    for file_path, description in files_to_check:
-        if not check_file_exists(file_path, description):
+    for (file_path, description), exists in zip(files_to_check, found):
+        if not check_file_exists(file_path, description, exists):
             all_files_exist = False
     
     # Check dependencies